@@ -5,8 +5,52 @@ Fix notification target by creating a working solution
 
 import asyncio
 import json
-from telethon import TelegramClient
+import os
+import aiofiles
+import aiofiles.os
+from typing import Optional, Tuple
 from telethon.tl.functions.channels import CreateChannelRequest
+from telethon.tl.types import Channel
+
+from telegram_session import telegram_session
+
+CONFIG_PATH = "config.json"
+DEFAULT_CHANNEL_TITLE = "Keyword Alerts"
+CHANNEL_ABOUT = "Private channel for keyword notifications"
+CHANNEL_READY_MSG = "✅ Channel '{title}' ready for notifications!"
+
+def make_create_request(title: str) -> CreateChannelRequest:
+    """Build the request for a private broadcast channel used for notifications."""
+    return CreateChannelRequest(
+        title=title,
+        about=CHANNEL_ABOUT,
+        megagroup=False,
+        broadcast=True
+    )
+
+async def load_config(path: str = CONFIG_PATH) -> dict:
+    """Read and parse the config file once without blocking the event loop."""
+    async with aiofiles.open(path, 'rb') as f:
+        return json.loads(await f.read())
+
+async def save_config(config: dict, path: str = CONFIG_PATH) -> None:
+    """Atomically replace the config file without blocking the event loop."""
+    data = json.dumps(config, indent=2, ensure_ascii=False).encode('utf-8')
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    try:
+        async with aiofiles.open(tmp_path, 'wb') as f:
+            await f.write(data)
+        # A crash can no longer leave a truncated config.json behind
+        await aiofiles.os.replace(tmp_path, path)
+    except OSError:
+        # config.json is bind-mounted as a single file in Docker and cannot be
+        # replaced there (EBUSY): rewrite it in place instead
+        async with aiofiles.open(path, 'wb') as f:
+            await f.write(data)
+    finally:
+        # Gone after a successful replace; left over if writing or replacing failed
+        if await aiofiles.os.path.exists(tmp_path):
+            await aiofiles.os.remove(tmp_path)
 
 async def fix_notification_target():
     """Fix notification target by creating a new private channel or using 'me'."""
@@ -15,8 +59,7 @@ async def fix_notification_target():
     
     # Load config
     try:
-        with open("config.json", 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = await load_config()
     except FileNotFoundError:
         print("❌ config.json not found!")
         return False
@@ -25,140 +68,125 @@ async def fix_notification_target():
     current_target = config.get('telegram', {}).get('notification_target', 'me')
     print(f"📋 Current target: {current_target}")
     
-    # Get credentials
-    telegram_config = config['telegram']
-    api_id = int(telegram_config['api_id'])
-    api_hash = telegram_config['api_hash']
-    session_name = telegram_config['session_name'].replace('/app/data/', './data/')
+    try:
+        async with telegram_session(config, ephemeral=True) as client:
+            return await _fix_with_client(client, config, current_target)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return False
+
+async def _fix_with_client(client, config: dict, current_target: str) -> bool:
+    """Run the interactive fix on an already connected client."""
+    me = await client.get_me()
+    
+    print(f"✅ Connected as: {me.first_name} (@{me.username or 'None'})")
+    print()
+    
+    # Test current target
+    if current_target != 'me':
+        print(f"🔍 Testing current target: {current_target}")
+        try:
+            await client.send_message(current_target, "🧪 Test message")
+            print("✅ Current target works! No changes needed.")
+            return True
+        except Exception as e:
+            print(f"❌ Current target failed: {e}")
+            print("   Creating a new solution...")
+    
+    print()
+    print("🎯 Choose a solution:")
+    print("1. Use 'me' (Saved Messages) - Always works")
+    print("2. Create a new private channel - Full control")
+    print("3. Use an existing channel/group you own")
+    
+    choice = input("\nEnter your choice (1-3): ").strip()
+    
+    handler = CHOICE_HANDLERS.get(choice, _use_fallback)
+    target, welcome = await handler(client)
+    config['telegram']['notification_target'] = target
+    
+    # Write the config once, whichever choice was made
+    await save_config(config)
+    
+    if welcome:
+        await client.send_message(target, welcome)
+    
+    print()
+    print("✅ Configuration updated!")
+    print("🚀 Restart Docker container: docker-compose restart telegram-monitor")
+    
+    return True
+
+async def _use_me(client) -> Tuple[str, Optional[str]]:
+    """Choice 1: use Saved Messages."""
+    print("✅ Target set to 'me' (Saved Messages)")
+    return 'me', "✅ Notification target set to Saved Messages!"
+
+async def _create_channel(client) -> Tuple[str, Optional[str]]:
+    """Choice 2: create a new private broadcast channel."""
+    channel_title = input(f"Enter channel name (or press Enter for '{DEFAULT_CHANNEL_TITLE}'): ").strip()
+    if not channel_title:
+        channel_title = DEFAULT_CHANNEL_TITLE
+    
+    print(f"📺 Creating channel: {channel_title}")
+    
+    result = await client(make_create_request(channel_title))
+    
+    channel = result.chats[0]
+    channel_id = f"-100{channel.id}"
+    
+    print(f"✅ Created channel: {channel_title}")
+    print(f"   ID: {channel_id}")
+    
+    return channel_id, CHANNEL_READY_MSG.format(title=channel_title)
+
+async def _use_existing(client) -> Tuple[str, Optional[str]]:
+    """Choice 3: pick one of the user's existing channels or groups."""
+    print("\n📋 Your channels and groups:")
+    
+    channels = []
+    
+    # Stream dialogs page by page and stop once 20 channels were found
+    async for dialog in client.iter_dialogs(limit=100, archived=False):
+        # Channel covers both broadcast channels and megagroups
+        if isinstance(dialog.entity, Channel):
+            channels.append(dialog)
+            print(f"   {len(channels)}. {dialog.name} (ID: {dialog.id})")
+            if len(channels) >= 20:
+                break
     
-    # Create client
-    client = TelegramClient(session_name, api_id, api_hash)
+    if not channels:
+        print("   No channels/groups found. Using 'me' instead.")
+        return 'me', None
     
     try:
-        await client.start()
-        me = await client.get_me()
-        
-        print(f"✅ Connected as: {me.first_name} (@{me.username or 'None'})")
-        print()
-        
-        # Test current target
-        if current_target != 'me':
-            print(f"🔍 Testing current target: {current_target}")
-            try:
-                entity = await client.get_entity(current_target)
-                await client.send_message(current_target, "🧪 Test message")
-                print("✅ Current target works! No changes needed.")
-                return True
-            except Exception as e:
-                print(f"❌ Current target failed: {e}")
-                print("   Creating a new solution...")
-        
-        print()
-        print("🎯 Choose a solution:")
-        print("1. Use 'me' (Saved Messages) - Always works")
-        print("2. Create a new private channel - Full control")
-        print("3. Use an existing channel/group you own")
-        
-        choice = input("\nEnter your choice (1-3): ").strip()
-        
-        if choice == "1":
-            # Use 'me'
-            config['telegram']['notification_target'] = 'me'
-            
-            with open("config.json", 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
-            
-            # Test
-            await client.send_message('me', "✅ Notification target set to Saved Messages!")
-            
-            print("✅ Target set to 'me' (Saved Messages)")
-            
-        elif choice == "2":
-            # Create new channel
-            channel_title = input("Enter channel name (or press Enter for 'Keyword Alerts'): ").strip()
-            if not channel_title:
-                channel_title = "Keyword Alerts"
-            
-            print(f"📺 Creating channel: {channel_title}")
-            
-            result = await client(CreateChannelRequest(
-                title=channel_title,
-                about="Private channel for keyword notifications",
-                megagroup=False,
-                broadcast=True
-            ))
-            
-            channel = result.chats[0]
-            channel_id = f"-100{channel.id}"
-            
-            # Update config
-            config['telegram']['notification_target'] = channel_id
-            
-            with open("config.json", 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+        selection = int(input(f"\nSelect channel (1-{len(channels)}): ")) - 1
+        if 0 <= selection < len(channels):
+            selected = channels[selection]
+            target_id = str(selected.id)
             
             # Test
-            await client.send_message(channel_id, f"✅ Channel '{channel_title}' ready for notifications!")
-            
-            print(f"✅ Created channel: {channel_title}")
-            print(f"   ID: {channel_id}")
+            await client.send_message(target_id, "🧪 Testing notification target...")
             
-        elif choice == "3":
-            # Use existing channel
-            print("\n📋 Your channels and groups:")
-            
-            dialogs = await client.get_dialogs()
-            channels = []
-            
-            for i, dialog in enumerate(dialogs[:20]):  # Show first 20
-                if hasattr(dialog.entity, 'broadcast') or hasattr(dialog.entity, 'megagroup'):
-                    channels.append(dialog)
-                    print(f"   {len(channels)}. {dialog.name} (ID: {dialog.id})")
-            
-            if not channels:
-                print("   No channels/groups found. Using 'me' instead.")
-                config['telegram']['notification_target'] = 'me'
-            else:
-                try:
-                    selection = int(input(f"\nSelect channel (1-{len(channels)}): ")) - 1
-                    if 0 <= selection < len(channels):
-                        selected = channels[selection]
-                        target_id = str(selected.id)
-                        
-                        # Test
-                        await client.send_message(target_id, "🧪 Testing notification target...")
-                        
-                        config['telegram']['notification_target'] = target_id
-                        print(f"✅ Target set to: {selected.name} ({target_id})")
-                    else:
-                        print("Invalid selection. Using 'me'.")
-                        config['telegram']['notification_target'] = 'me'
-                except:
-                    print("Invalid input. Using 'me'.")
-                    config['telegram']['notification_target'] = 'me'
-            
-            with open("config.json", 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
-        
-        else:
-            print("Invalid choice. Using 'me'.")
-            config['telegram']['notification_target'] = 'me'
-            
-            with open("config.json", 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
-        
-        print()
-        print("✅ Configuration updated!")
-        print("🚀 Restart Docker container: docker-compose restart telegram-monitor")
-        
-        return True
+            print(f"✅ Target set to: {selected.name} ({target_id})")
+            return target_id, None
         
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        return False
-        
-    finally:
-        await client.disconnect()
+        print("Invalid selection. Using 'me'.")
+    except:
+        print("Invalid input. Using 'me'.")
+    return 'me', None
+
+async def _use_fallback(client) -> Tuple[str, Optional[str]]:
+    """Unknown choice: fall back to Saved Messages."""
+    print("Invalid choice. Using 'me'.")
+    return 'me', None
+
+# Menu choice -> handler returning (new target, message to send once saved)
+CHOICE_HANDLERS = {
+    "1": _use_me,
+    "2": _create_channel,
+    "3": _use_existing,
+}
 
 def main():
     """Main function."""
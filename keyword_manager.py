@@ -4,499 +4,806 @@ Keyword Manager for Telegram Keyword Monitor
 Allows managing keywords via Telegram commands in Saved Messages
 """
 
+import asyncio
+import hashlib
 import json
+import logging
+import os
 import re
-from typing import List, Dict, Tuple
+import time
+from types import MappingProxyType
+import aiofiles
+import aiofiles.os
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
+# A keyword is treated as regex if it contains '(' or '[' ('(?i)' starts with '(')
+_REGEX_TRIGGER = frozenset('([')
+
+
+# Static replies, built once at import
+_HELP_TEXT = """🤖 **Telegram Keyword Monitor - Befehle:**
+
+**Keywords verwalten:**
+• `/keywords` - Alle Keywords anzeigen
+• `/add <keyword>` - Keyword hinzufügen
+• `/remove <nummer|keyword>` - Keyword entfernen
+• `/clear` - Alle Keywords löschen
+
+**Gruppen verwalten:**
+• `/groups` - Gruppen-Verwaltung Hilfe
+• `/whitelist <action>` - Whitelist verwalten
+• `/blacklist <action>` - Blacklist verwalten
+
+**Duplikat-Erkennung:**
+• `/duplicates` - Duplikat-Einstellungen anzeigen
+• `/duplicates on/off` - Duplikat-Erkennung ein/ausschalten
+• `/duplicates hours <zahl>` - Hash-Gültigkeit setzen
+
+**Benachrichtigungen:**
+• `/target` - Benachrichtigungs-Ziel verwalten
+• `/target set @channel` - Kanal für Benachrichtigungen setzen
+• `/target test` - Test-Nachricht senden
+
+**Status & Info:**
+• `/status` - Monitor-Status anzeigen
+• `/help` - Diese Hilfe anzeigen
+
+**Beispiele:**
+• `/add python` - Einfaches Keyword
+• `/add (?i)machine learning` - Regex (case-insensitive)
+• `/remove 1` - Erstes Keyword entfernen
+• `/whitelist add Python Jobs` - Gruppe zur Whitelist
+
+💡 **Hinweis:** Alle Befehle funktionieren nur in Ihren "Saved Messages"."""
+
+_GROUPS_HELP = """📋 **Gruppen-Verwaltung:**
+
+**Whitelist (nur diese Gruppen überwachen):**
+• `/whitelist add <gruppenname>` - Gruppe zur Whitelist hinzufügen
+• `/whitelist remove <gruppenname>` - Gruppe von Whitelist entfernen
+• `/whitelist list` - Whitelist anzeigen
+• `/whitelist clear` - Whitelist leeren
+
+**Blacklist (diese Gruppen ausschließen):**
+• `/blacklist add <gruppenname>` - Gruppe zur Blacklist hinzufügen
+• `/blacklist remove <gruppenname>` - Gruppe von Blacklist entfernen
+• `/blacklist list` - Blacklist anzeigen
+• `/blacklist clear` - Blacklist leeren
+
+💡 **Hinweis:** Wenn eine Whitelist existiert, werden nur diese Gruppen überwacht."""
+
+_DEBUG_HELP = """🔧 **Duplikat-Debug Befehle:**
+
+• `/duplicates debug status` - Zeige Debug-Informationen
+• `/duplicates debug clear` - Lösche alle gespeicherten Hashes
+• `/duplicates debug test` - Teste Hash-Generierung
+
+**Beispiel:** `/duplicates debug status`"""
+
+# Fixed tails of the unknown command/action replies
+_UNKNOWN_COMMAND_SUFFIX = "\n\n" + _HELP_TEXT
+_GROUP_ACTIONS_SUFFIX = "\n\nVerfügbare Aktionen: add, remove, list, clear"
+_DUP_ACTIONS_SUFFIX = "\n\nVerfügbare Aktionen: on, off, hours, sender, debug, clear"
+_DEBUG_ACTIONS_SUFFIX = "\n\nVerfügbare Aktionen: status, clear, test"
+_TARGET_ACTIONS_SUFFIX = "\n\nVerfügbare Aktionen: set, test, check"
+
+_DUPLICATES_TEMPLATE = (
+    "🔄 **Duplikat-Erkennung Einstellungen:**\n\n"
+    "Status: {status}\n"
+    "Hash-Gültigkeit: {hours} Stunden\n"
+    "Absender berücksichtigen: {sender}\n\n"
+    "**Verfügbare Befehle:**\n"
+    "• `/duplicates on` - Duplikat-Erkennung aktivieren\n"
+    "• `/duplicates off` - Duplikat-Erkennung deaktivieren\n"
+    "• `/duplicates hours <zahl>` - Hash-Gültigkeit setzen\n"
+    "• `/duplicates sender on/off` - Absender-Berücksichtigung\n"
+)
+
+# Indexed with a bool: _YESNO[flag]
+_YESNO = ('Nein', 'Ja')
+
+_STATUS_TEMPLATE = (
+    "📊 **Monitor Status:**\n\n"
+    "🔍 Keywords: {keywords}\n"
+    "📝 Case Sensitive: {case_sensitive}\n"
+    "📄 Vollständige Nachrichten: {full_message}\n"
+    "📏 Max. Nachrichtenlänge: {max_length}\n"
+    "📷 Medien weiterleiten: {forward_media}\n"
+    "📤 Nur Weiterleitung bei Medien: {media_only}\n"
+    "📬 Benachrichtigungs-Ziel: {target}\n\n"
+    "✅ Whitelist: {whitelist} Gruppen\n"
+    "❌ Blacklist: {blacklist} Gruppen\n\n"
+    "🔄 Duplikat-Erkennung: {dup_status}\n"
+    "{dup_details}\n"
+    "⏰ Letzte Aktualisierung: {time}"
+)
+
+# Extra /status lines while duplicate detection is enabled
+_STATUS_DUP_DETAILS = (
+    "⏱️ Hash-Gültigkeit: {hours} Stunden\n"
+    "👤 Absender berücksichtigen: {sender}\n"
+)
+
+_HASH_CLEAR_TEXT = (
+    "🗑️ **Hash-Speicher leeren:**\n\n"
+    "Um alle gespeicherten Message-Hashes zu löschen,\n"
+    "starten Sie den Container neu:\n\n"
+    "`docker-compose restart telegram-monitor`\n\n"
+    "⚠️ **Warnung:** Danach werden alle Nachrichten als 'neu' behandelt!"
+)
+
+_DEBUG_STATUS_TEMPLATE = (
+    "🔧 **Duplikat-Debug Status:**\n\n"
+    "**Gespeicherte Hashes:** Wird zur Laufzeit angezeigt\n"
+    "**Einstellungen:**\n"
+    "- Aktiviert: {enabled}\n"
+    "- Gültigkeit: {hours} Stunden\n"
+    "- Absender berücksichtigen: {sender}\n\n"
+    "💡 **Hinweis:** Detaillierte Hash-Informationen werden in den Logs angezeigt.\n"
+    "Verwenden Sie `docker-compose logs -f telegram-monitor` um sie zu sehen."
+)
+
+_DEBUG_CLEAR_TEXT = (
+    "⚠️ **Hash-Speicher leeren:**\n\n"
+    "Dies würde alle gespeicherten Message-Hashes löschen.\n"
+    "Danach werden alle Nachrichten als 'neu' behandelt.\n\n"
+    "💡 **Hinweis:** Diese Funktion ist nur zur Laufzeit verfügbar.\n"
+    "Starten Sie den Container neu um den Hash-Speicher zu leeren:\n"
+    "`docker-compose restart telegram-monitor`"
+)
+
+_HASH_TEST_TEMPLATE = (
+    "🧪 **Hash-Test:**\n\n"
+    "**Original:** `{original}`\n"
+    "**Normalisiert:** `{normalized}`\n"
+    "**Hash:** `{hash}...`\n\n"
+    "💡 Gleiche Nachrichten erzeugen den gleichen Hash."
+)
+
+_TARGET_HELP_TEMPLATE = (
+    "📬 **Benachrichtigungs-Ziel Verwaltung:**\n\n"
+    "**Aktuelles Ziel:** `{target}`\n\n"
+    "**Verfügbare Befehle:**\n"
+    "• `/target set me` - Saved Messages verwenden\n"
+    "• `/target set @channel_name` - Öffentlichen Kanal verwenden\n"
+    "• `/target set -1001234567890` - Chat-ID verwenden\n"
+    "• `/target set https://t.me/+xxxxx` - Privaten Kanal per Invite-Link\n"
+    "• `/target test` - Test-Nachricht senden\n"
+    "• `/target check <ziel>` - Ziel-Berechtigung prüfen\n\n"
+    "**Hinweise:**\n"
+    "- Für Kanäle: Erstellen Sie einen Kanal und fügen Sie sich selbst als Admin hinzu\n"
+    "- Für Gruppen: Verwenden Sie die Chat-ID (negative Zahl)\n"
+    "- 'me' = Ihre Saved Messages (Standard)\n"
+    "- Bei Chat-IDs: Stellen Sie sicher, dass Sie Schreibrechte haben\n\n"
+    "**Troubleshooting:**\n"
+    "- Kanal-ID funktioniert nicht? Versuchen Sie @username\n"
+    "- Keine Berechtigung? Prüfen Sie Admin-Rechte im Kanal\n"
+    "- Immer noch Probleme? Verwenden Sie 'me' als Fallback"
+)
+
+_TARGET_TEST_TEMPLATE = (
+    "🧪 **Test-Nachricht für Ziel: `{target}`**\n\n"
+    "Wenn Sie diese Nachricht erhalten, funktioniert das Benachrichtigungs-Ziel korrekt!\n\n"
+    "**Ziel:** {target}\n"
+    "**Zeit:** {time}\n\n"
+    "💡 **Hinweis:** Wenn Sie diese Nachricht nicht im konfigurierten Ziel sehen,\n"
+    "überprüfen Sie die Berechtigungen oder verwenden Sie einen anderen Ziel-Typ."
+)
+
+_TARGET_CHECK_TEMPLATE = (
+    "🔍 **Ziel-Prüfung für: `{target}`**\n\n"
+    "**Wird geprüft...**\n"
+    "- Format: {format}\n"
+    "- Typ: {kind}\n\n"
+    "💡 **Hinweis:** Detaillierte Prüfung wird in den Logs angezeigt.\n"
+    "Verwenden Sie `docker-compose logs -f telegram-monitor` um Details zu sehen."
+)
+
+_INVITE_SAVED_TEMPLATE = (
+    "✅ **Invite-Link gespeichert!**\n\n"
+    "**Link:** `{link}`\n"
+    "**Hash:** `{hash}`\n\n"
+    "🔄 **Nächste Schritte:**\n"
+    "1. Der Monitor wird automatisch dem Kanal beitreten\n"
+    "2. Verwenden Sie `/target test` zum Testen\n"
+    "3. Bei Problemen wird automatisch zu 'me' gewechselt\n\n"
+    "💡 **Hinweis:** Der private Kanal wird beim nächsten Start automatisch verbunden."
+)
+
+
+def _split_first(text: str) -> Tuple[str, str]:
+    """Split off the first word, returning it and the remaining text."""
+    parts = text.split(None, 1)
+    if not parts:
+        return '', ''
+    return parts[0], parts[1].strip() if len(parts) > 1 else ''
+
+
+def normalize_message(text: str) -> str:
+    """Lowercase a message and collapse whitespace, as done before hashing it for duplicate detection."""
+    # split() drops leading/trailing runs and splits on the same characters as \s
+    return ' '.join(text.lower().split())
+
+
+def hash_message(text: str) -> bytes:
+    """16-byte digest used to recognise duplicate messages; not a security hash."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def _is_int(text: str) -> bool:
+    """Check whether int() accepts the text, signs and digit separators included."""
+    # Plain digits are the common case and need no exception
+    if text.isdecimal():
+        return True
+    try:
+        int(text)
+    except ValueError:
+        return False
+    return True
+
+
+# Settings used when the config has no duplicate_detection section yet
+_DEFAULT_DUP = {'enabled': True, 'expiry_hours': 24, 'include_sender': True}
+
+# Last whole second formatted by _now_str() and its formatted form
+_TS_CACHE = [0, ""]
+
+
+def _now_str() -> str:
+    """Current local time as 'YYYY-mm-dd HH:MM:SS', formatted at most once per second."""
+    t = int(time.time())
+    if t != _TS_CACHE[0]:
+        _TS_CACHE[0] = t
+        _TS_CACHE[1] = datetime.fromtimestamp(t).strftime('%Y-%m-%d %H:%M:%S')
+    return _TS_CACHE[1]
+
+
+def is_regex_keyword(keyword: str) -> bool:
+    """Tell regex keywords from plain ones; shared with the monitor's keyword matching."""
+    return not _REGEX_TRIGGER.isdisjoint(keyword)
+
+
+@lru_cache(maxsize=256)
+def compile_regex(pattern: str, flags: int = 0) -> re.Pattern:
+    """Compile a keyword regex once; shared with the monitor's keyword matching."""
+    return re.compile(pattern, flags)
+
 
 class KeywordManager:
     """Manages keywords through Telegram commands."""
     
+    __slots__ = ('config_path', 'config_version', '_cache', '_cache_stat', '_dirty', '_flush_task', '_member_sets', '_fragments')
+    
+    # Seconds to wait for further changes before writing config.json
+    SAVE_DELAY = 0.5
+    
     def __init__(self, config_path: str = "config.json"):
         self.config_path = config_path
-        # Commands that need async (take args parameter)
-        self.async_commands = {
-            '/keywords': self.list_keywords,
-            '/add': self.add_keyword,
-            '/remove': self.remove_keyword,
-            '/clear': self.clear_keywords,
-            '/status': self.show_status,
-            '/groups': self.manage_groups,
-            '/whitelist': self.manage_whitelist,
-            '/blacklist': self.manage_blacklist,
-            '/duplicates': self.manage_duplicates,
-            '/target': self.manage_notification_target
-        }
-        
-        # Commands that are sync (no args parameter)
-        self.sync_commands = {
-            '/help': self.show_help
-        }
-    
-    def load_config(self) -> Dict:
-        """Load configuration from file."""
+        # Bumped whenever the config changes, through a command or on disk
+        self.config_version = 0
+        # Parsed config and the file (mtime, size) it was read at
+        self._cache = None
+        self._cache_stat = None
+        # Changes not yet written to disk and the task that will write them
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+        # Membership sets for the keyword and group lists of the cached config
+        self._member_sets: Dict[str, set] = {}
+        # Serialized top-level sections of the cached config, reused until the section
+        # changes. Built only from the cache and dropped whenever it is replaced or a
+        # section is saved, so they always match what the next write serializes.
+        self._fragments: Dict[str, str] = {}
+    
+    async def load_config(self) -> Dict:
+        """Load configuration from file, reusing the parsed copy while the file is unchanged."""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            # Unsaved changes are newer than anything on disk
+            if self._dirty:
+                return self._cache
+            
+            # Same-second rewrites can keep the mtime on coarse filesystems, the size catches most of them
+            st = await aiofiles.os.stat(self.config_path)
+            key = (st.st_mtime_ns, st.st_size)
+            if self._cache is not None and key == self._cache_stat:
+                return self._cache
+            
+            # Parse the raw bytes in one go; json detects the UTF-8 encoding
+            async with aiofiles.open(self.config_path, 'rb') as f:
+                config = json.loads(await f.read())
+            
+            self._cache = config
+            self._cache_stat = key
+            self._member_sets.clear()
+            self._fragments.clear()
+            self.config_version += 1
+            return config
         except Exception as e:
             raise Exception(f"Error loading config: {e}")
     
-    def save_config(self, config: Dict) -> None:
-        """Save configuration to file."""
+    async def save_config(self, config: Dict, *sections: str) -> None:
+        """Save configuration; the write is batched with changes that follow shortly.
+        
+        Naming the changed top-level sections lets the write reuse the serialized
+        form of all others; without names the whole config is serialized again.
+        """
+        # The membership sets are kept in step with edits to the cached config itself
+        if config is not self._cache:
+            self._member_sets.clear()
+            self._fragments.clear()
+        elif sections:
+            for section in sections:
+                self._fragments.pop(section, None)
+        else:
+            self._fragments.clear()
+        self._cache = config
+        self._dirty = True
+        self.config_version += 1
+        
+        # Changes arriving before the delay expires share one write
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+    
+    async def flush(self) -> None:
+        """Write all pending configuration changes before returning."""
+        # Cancelling the task could cut a write short, so let it finish instead
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._flush_task
+        self._flush_task = None
+        
+        if self._dirty:
+            await self._write_config()
+    
+    async def _delayed_flush(self) -> None:
+        """Write pending changes after SAVE_DELAY seconds, and again for changes saved meanwhile."""
+        while self._dirty:
+            await asyncio.sleep(self.SAVE_DELAY)
+            try:
+                await self._write_config()
+            except Exception as e:
+                # Changes stay pending and are retried on the next save or flush
+                logging.error(str(e))
+                return
+    
+    async def _write_config(self) -> None:
+        """Atomically write the cached configuration to file."""
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            # Saves made while the write is under way bump the version past this one
+            version = self.config_version
+            data = self._serialize().encode('utf-8')
+            
+            # Write a per-process temp file and swap it in, so readers never see a
+            # partial config and a fix script running alongside cannot share the temp file
+            tmp_path = f"{self.config_path}.tmp.{os.getpid()}"
+            try:
+                async with aiofiles.open(tmp_path, 'wb') as f:
+                    await f.write(data)
+                    await f.flush()
+                    await aiofiles.os.wrap(os.fsync)(f.fileno())
+                await aiofiles.os.replace(tmp_path, self.config_path)
+            except OSError:
+                # config.json is bind-mounted as a single file in Docker and its
+                # directory may not be writable: rewrite it in place instead
+                if await aiofiles.os.path.exists(tmp_path):
+                    await aiofiles.os.remove(tmp_path)
+                async with aiofiles.open(self.config_path, 'wb') as f:
+                    await f.write(data)
+            
+            # Our own write must not look like an external change; changes saved
+            # during the write are not on disk yet and stay pending
+            self._dirty = self.config_version != version
+            st = await aiofiles.os.stat(self.config_path)
+            self._cache_stat = (st.st_mtime_ns, st.st_size)
         except Exception as e:
             raise Exception(f"Error saving config: {e}")
     
+    def _serialize(self) -> str:
+        """Render the cached config exactly like json.dumps(indent=2), re-dumping only changed sections."""
+        fragments = self._fragments
+        parts = []
+        for key, value in self._cache.items():
+            fragment = fragments.get(key)
+            if fragment is None:
+                # Nested lines sit one level deeper inside the top-level object
+                dumped = json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+                fragment = fragments[key] = f"  {json.dumps(key, ensure_ascii=False)}: {dumped}"
+            parts.append(fragment)
+        if not parts:
+            return "{}"
+        return "{\n" + ",\n".join(parts) + "\n}"
+    
+    def _contains(self, name: str, items: List[str], value: str) -> bool:
+        """Check membership in a config list through a set built once per config load."""
+        members = self._member_sets.get(name)
+        if members is None:
+            members = self._member_sets[name] = set(items)
+        return value in members
+    
+    def _added(self, name: str, value: str) -> None:
+        """Record a value appended to a config list."""
+        members = self._member_sets.get(name)
+        if members is not None:
+            members.add(value)
+    
+    def _removed(self, name: str, items: List[str], value: str) -> None:
+        """Record a value removed from a config list, which may still hold a copy of it."""
+        members = self._member_sets.get(name)
+        if members is not None and value not in items:
+            members.discard(value)
+    
     async def process_command(self, message_text: str) -> str:
         """Process a command message and return response."""
+        # Split off the command in one pass; handlers get the raw argument text
+        parts = message_text.split(None, 1)
+        if not parts or not parts[0].startswith('/'):
+            return self.show_help()
+        
+        command = parts[0].lower()
+        arg_text = parts[1].strip() if len(parts) > 1 else ''
+        
+        # Execute command
+        entry = self._COMMANDS.get(command)
+        if entry is None:
+            return f"❌ Unbekannter Befehl: {command}{_UNKNOWN_COMMAND_SUFFIX}"
+        
+        handler, is_async = entry
+        if not is_async:
+            # Sync commands (like /help)
+            return handler(self)
+        
+        # Only the handlers touch the config and can fail
         try:
-            # Parse command and arguments
-            parts = message_text.strip().split()
-            if not parts or not parts[0].startswith('/'):
-                return self.show_help()
-            
-            command = parts[0].lower()
-            args = parts[1:] if len(parts) > 1 else []
-            
-            # Execute command
-            if command in self.sync_commands:
-                # Sync commands (like /help)
-                return self.sync_commands[command]()
-            elif command in self.async_commands:
-                # Async commands (most commands)
-                return await self.async_commands[command](args)
-            else:
-                return f"❌ Unbekannter Befehl: {command}\n\n{self.show_help()}"
-                
+            return await handler(self, arg_text)
         except Exception as e:
             return f"❌ Fehler beim Verarbeiten des Befehls: {str(e)}"
     
-    async def list_keywords(self, args: List[str]) -> str:
+    async def list_keywords(self, arg_text: str) -> str:
         """List all current keywords."""
-        config = self.load_config()
+        config = await self.load_config()
         keywords = config.get('keywords', [])
         
         if not keywords:
             return "📝 Keine Keywords konfiguriert.\n\nVerwenden Sie `/add <keyword>` um Keywords hinzuzufügen."
         
-        response = f"📝 **Aktuelle Keywords ({len(keywords)}):**\n\n"
+        lines = [f"📝 **Aktuelle Keywords ({len(keywords)}):**", ""]
+        append = lines.append
         for i, keyword in enumerate(keywords, 1):
             # Check if it's a regex pattern
-            if keyword.startswith('(?i)') or '(' in keyword or '[' in keyword:
-                response += f"{i}. `{keyword}` (Regex)\n"
+            if is_regex_keyword(keyword):
+                append(f"{i}. `{keyword}` (Regex)")
             else:
-                response += f"{i}. `{keyword}`\n"
+                append(f"{i}. `{keyword}`")
         
-        response += f"\n💡 Verwenden Sie `/remove <nummer>` zum Löschen"
-        return response
+        append("")
+        append("💡 Verwenden Sie `/remove <nummer>` zum Löschen")
+        return "\n".join(lines)
     
-    async def add_keyword(self, args: List[str]) -> str:
+    async def add_keyword(self, arg_text: str) -> str:
         """Add a new keyword."""
-        if not args:
+        if not arg_text:
             return "❌ Bitte geben Sie ein Keyword an.\n\nBeispiel: `/add python`"
         
-        keyword = ' '.join(args)
+        # Collapse runs of whitespace into single spaces, as stored keywords always were
+        keyword = ' '.join(arg_text.split())
         
         # Validate regex if it looks like one
-        if keyword.startswith('(?i)') or '(' in keyword or '[' in keyword:
+        if is_regex_keyword(keyword):
             try:
-                re.compile(keyword)
+                compile_regex(keyword)
             except re.error as e:
-                return f"❌ Ungültiger Regex-Ausdruck: {e}\n\nBeispiel: `/add (?i)machine learning`"
+                return f"❌ Ungültiger Regex-Ausdruck: {str(e)}\n\nBeispiel: `/add (?i)machine learning`"
         
-        config = self.load_config()
+        config = await self.load_config()
         keywords = config.get('keywords', [])
         
-        if keyword in keywords:
+        if self._contains('keywords', keywords, keyword):
             return f"⚠️ Keyword `{keyword}` existiert bereits."
         
         keywords.append(keyword)
         config['keywords'] = keywords
-        self.save_config(config)
+        self._added('keywords', keyword)
+        await self.save_config(config, 'keywords')
         
         return f"✅ Keyword `{keyword}` hinzugefügt.\n\n📝 Aktuelle Anzahl: {len(keywords)}"
     
-    async def remove_keyword(self, args: List[str]) -> str:
+    async def remove_keyword(self, arg_text: str) -> str:
         """Remove a keyword by number or text."""
-        if not args:
+        if not arg_text:
             return "❌ Bitte geben Sie eine Nummer oder das Keyword an.\n\nBeispiel: `/remove 1` oder `/remove python`"
         
-        config = self.load_config()
+        config = await self.load_config()
         keywords = config.get('keywords', [])
         
         if not keywords:
             return "❌ Keine Keywords zum Entfernen vorhanden."
         
-        # Try to parse as number first
-        try:
-            index = int(args[0]) - 1
+        # A number selects by position, anything else is matched as text
+        first = _split_first(arg_text)[0]
+        if _is_int(first):
+            index = int(first) - 1
             if 0 <= index < len(keywords):
                 removed_keyword = keywords.pop(index)
                 config['keywords'] = keywords
-                self.save_config(config)
+                self._removed('keywords', keywords, removed_keyword)
+                await self.save_config(config, 'keywords')
                 return f"✅ Keyword `{removed_keyword}` entfernt.\n\n📝 Verbleibende Keywords: {len(keywords)}"
             else:
                 return f"❌ Ungültige Nummer. Verwenden Sie 1-{len(keywords)}."
-        except ValueError:
-            # Try to find by text
-            keyword_to_remove = ' '.join(args)
-            if keyword_to_remove in keywords:
-                keywords.remove(keyword_to_remove)
-                config['keywords'] = keywords
-                self.save_config(config)
-                return f"✅ Keyword `{keyword_to_remove}` entfernt.\n\n📝 Verbleibende Keywords: {len(keywords)}"
-            else:
-                return f"❌ Keyword `{keyword_to_remove}` nicht gefunden."
+        
+        keyword_to_remove = ' '.join(arg_text.split())
+        if self._contains('keywords', keywords, keyword_to_remove):
+            keywords.remove(keyword_to_remove)
+            config['keywords'] = keywords
+            self._removed('keywords', keywords, keyword_to_remove)
+            await self.save_config(config, 'keywords')
+            return f"✅ Keyword `{keyword_to_remove}` entfernt.\n\n📝 Verbleibende Keywords: {len(keywords)}"
+        else:
+            return f"❌ Keyword `{keyword_to_remove}` nicht gefunden."
     
-    async def clear_keywords(self, args: List[str]) -> str:
+    async def clear_keywords(self, arg_text: str) -> str:
         """Clear all keywords."""
-        config = self.load_config()
+        config = await self.load_config()
         keyword_count = len(config.get('keywords', []))
         
         if keyword_count == 0:
             return "❌ Keine Keywords zum Löschen vorhanden."
         
         config['keywords'] = []
-        self.save_config(config)
+        self._member_sets['keywords'] = set()
+        await self.save_config(config, 'keywords')
         
         return f"✅ Alle {keyword_count} Keywords gelöscht."
     
-    async def show_status(self, args: List[str]) -> str:
+    async def show_status(self, arg_text: str) -> str:
         """Show current monitor status."""
-        config = self.load_config()
+        config = await self.load_config()
         
-        keywords = config.get('keywords', [])
-        settings = config.get('settings', {})
+        get_setting = config.get('settings', {}).get
         groups = config.get('groups', {})
-        
-        response = "📊 **Monitor Status:**\n\n"
-        response += f"🔍 Keywords: {len(keywords)}\n"
-        response += f"📝 Case Sensitive: {'Ja' if settings.get('case_sensitive', False) else 'Nein'}\n"
-        response += f"📄 Vollständige Nachrichten: {'Ja' if settings.get('send_full_message', True) else 'Nein'}\n"
-        response += f"📏 Max. Nachrichtenlänge: {settings.get('max_message_length', 500)}\n"
-        response += f"📷 Medien weiterleiten: {'Ja' if settings.get('forward_media', True) else 'Nein'}\n"
-        response += f"📤 Nur Weiterleitung bei Medien: {'Ja' if settings.get('media_only_forward', True) else 'Nein'}\n"
-        
-        # Notification target
-        telegram_config = config.get('telegram', {})
-        notification_target = telegram_config.get('notification_target', 'me')
-        response += f"📬 Benachrichtigungs-Ziel: {notification_target}\n\n"
-        
-        whitelist = groups.get('whitelist', [])
-        blacklist = groups.get('blacklist', [])
-        
-        response += f"✅ Whitelist: {len(whitelist)} Gruppen\n"
-        response += f"❌ Blacklist: {len(blacklist)} Gruppen\n\n"
-        
-        # Duplicate detection status
         dup_config = config.get('duplicate_detection', {})
         dup_enabled = dup_config.get('enabled', True)
-        dup_hours = dup_config.get('expiry_hours', 24)
-        dup_sender = dup_config.get('include_sender', True)
         
-        response += f"🔄 Duplikat-Erkennung: {'Aktiviert' if dup_enabled else 'Deaktiviert'}\n"
+        dup_details = ''
         if dup_enabled:
-            response += f"⏱️ Hash-Gültigkeit: {dup_hours} Stunden\n"
-            response += f"👤 Absender berücksichtigen: {'Ja' if dup_sender else 'Nein'}\n"
-        
-        response += f"\n⏰ Letzte Aktualisierung: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        
-        return response
+            dup_details = _STATUS_DUP_DETAILS.format(
+                hours=dup_config.get('expiry_hours', 24),
+                sender=_YESNO[bool(dup_config.get('include_sender', True))]
+            )
+        
+        return _STATUS_TEMPLATE.format(
+            keywords=len(config.get('keywords', [])),
+            case_sensitive=_YESNO[bool(get_setting('case_sensitive', False))],
+            full_message=_YESNO[bool(get_setting('send_full_message', True))],
+            max_length=get_setting('max_message_length', 500),
+            forward_media=_YESNO[bool(get_setting('forward_media', True))],
+            media_only=_YESNO[bool(get_setting('media_only_forward', True))],
+            target=config.get('telegram', {}).get('notification_target', 'me'),
+            whitelist=len(groups.get('whitelist', [])),
+            blacklist=len(groups.get('blacklist', [])),
+            dup_status='Aktiviert' if dup_enabled else 'Deaktiviert',
+            dup_details=dup_details,
+            time=_now_str()
+        )
     
-    async def manage_groups(self, args: List[str]) -> str:
+    async def manage_groups(self, arg_text: str) -> str:
         """Show group management help."""
-        return """📋 **Gruppen-Verwaltung:**
-
-**Whitelist (nur diese Gruppen überwachen):**
-• `/whitelist add <gruppenname>` - Gruppe zur Whitelist hinzufügen
-• `/whitelist remove <gruppenname>` - Gruppe von Whitelist entfernen
-• `/whitelist list` - Whitelist anzeigen
-• `/whitelist clear` - Whitelist leeren
-
-**Blacklist (diese Gruppen ausschließen):**
-• `/blacklist add <gruppenname>` - Gruppe zur Blacklist hinzufügen
-• `/blacklist remove <gruppenname>` - Gruppe von Blacklist entfernen
-• `/blacklist list` - Blacklist anzeigen
-• `/blacklist clear` - Blacklist leeren
-
-💡 **Hinweis:** Wenn eine Whitelist existiert, werden nur diese Gruppen überwacht."""
+        return _GROUPS_HELP
     
-    async def manage_whitelist(self, args: List[str]) -> str:
+    async def manage_whitelist(self, arg_text: str) -> str:
         """Manage whitelist."""
-        return await self._manage_group_list('whitelist', args)
+        return await self._manage_group_list('whitelist', arg_text)
     
-    async def manage_blacklist(self, args: List[str]) -> str:
+    async def manage_blacklist(self, arg_text: str) -> str:
         """Manage blacklist."""
-        return await self._manage_group_list('blacklist', args)
+        return await self._manage_group_list('blacklist', arg_text)
     
-    async def _manage_group_list(self, list_type: str, args: List[str]) -> str:
+    async def _manage_group_list(self, list_type: str, arg_text: str) -> str:
         """Helper method to manage group lists."""
-        if not args:
+        if not arg_text:
             return f"❌ Bitte geben Sie eine Aktion an: add, remove, list, clear\n\nBeispiel: `/{list_type} list`"
         
-        action = args[0].lower()
-        config = self.load_config()
+        action, rest = _split_first(arg_text)
+        action = action.lower()
+        handler = self._GROUP_ACTIONS.get(action)
+        if handler is None:
+            return f"❌ Unbekannte Aktion: {action}{_GROUP_ACTIONS_SUFFIX}"
+        
+        # Read-only lookups; only adding creates missing sections in the config
+        config = await self.load_config()
         groups = config.get('groups', {})
         group_list = groups.get(list_type, [])
+        return await handler(self, list_type, rest, config, groups, group_list)
+    
+    async def _group_list(self, list_type: str, rest: str, config: Dict, groups: Dict, group_list: List[str]) -> str:
+        """Show the groups in a list."""
+        if not group_list:
+            return f"📝 {list_type.capitalize()} ist leer."
+        
+        lines = [f"📝 **{list_type.capitalize()} ({len(group_list)}):**", ""]
+        lines.extend(f"{i}. `{group}`" for i, group in enumerate(group_list, 1))
+        # The reply always ended with a newline
+        lines.append("")
+        return "\n".join(lines)
+    
+    async def _group_add(self, list_type: str, rest: str, config: Dict, groups: Dict, group_list: List[str]) -> str:
+        """Add a group to a list."""
+        if not rest:
+            return f"❌ Bitte geben Sie einen Gruppennamen an.\n\nBeispiel: `/{list_type} add Python Developers`"
         
-        if action == 'list':
-            if not group_list:
-                return f"📝 {list_type.capitalize()} ist leer."
-            
-            response = f"📝 **{list_type.capitalize()} ({len(group_list)}):**\n\n"
-            for i, group in enumerate(group_list, 1):
-                response += f"{i}. `{group}`\n"
-            return response
-        
-        elif action == 'add':
-            if len(args) < 2:
-                return f"❌ Bitte geben Sie einen Gruppennamen an.\n\nBeispiel: `/{list_type} add Python Developers`"
-            
-            group_name = ' '.join(args[1:])
-            if group_name in group_list:
-                return f"⚠️ Gruppe `{group_name}` ist bereits in der {list_type}."
-            
-            group_list.append(group_name)
-            groups[list_type] = group_list
-            config['groups'] = groups
-            self.save_config(config)
-            
-            return f"✅ Gruppe `{group_name}` zur {list_type} hinzugefügt.\n\n📝 Anzahl: {len(group_list)}"
-        
-        elif action == 'remove':
-            if len(args) < 2:
-                return f"❌ Bitte geben Sie eine Nummer oder Gruppennamen an.\n\nBeispiel: `/{list_type} remove 1`"
-            
-            # Try number first
-            try:
-                index = int(args[1]) - 1
-                if 0 <= index < len(group_list):
-                    removed_group = group_list.pop(index)
-                    groups[list_type] = group_list
-                    config['groups'] = groups
-                    self.save_config(config)
-                    return f"✅ Gruppe `{removed_group}` von {list_type} entfernt."
-                else:
-                    return f"❌ Ungültige Nummer. Verwenden Sie 1-{len(group_list)}."
-            except ValueError:
-                # Try by name
-                group_name = ' '.join(args[1:])
-                if group_name in group_list:
-                    group_list.remove(group_name)
-                    groups[list_type] = group_list
-                    config['groups'] = groups
-                    self.save_config(config)
-                    return f"✅ Gruppe `{group_name}` von {list_type} entfernt."
-                else:
-                    return f"❌ Gruppe `{group_name}` nicht in {list_type} gefunden."
+        group_name = ' '.join(rest.split())
+        if self._contains(list_type, group_list, group_name):
+            return f"⚠️ Gruppe `{group_name}` ist bereits in der {list_type}."
         
-        elif action == 'clear':
-            count = len(group_list)
-            if count == 0:
-                return f"❌ {list_type.capitalize()} ist bereits leer."
-            
-            groups[list_type] = []
-            config['groups'] = groups
-            self.save_config(config)
-            
-            return f"✅ {list_type.capitalize()} geleert ({count} Gruppen entfernt)."
+        group_list = config.setdefault('groups', {}).setdefault(list_type, group_list)
+        group_list.append(group_name)
+        self._added(list_type, group_name)
+        await self.save_config(config, 'groups')
         
+        return f"✅ Gruppe `{group_name}` zur {list_type} hinzugefügt.\n\n📝 Anzahl: {len(group_list)}"
+    
+    async def _group_remove(self, list_type: str, rest: str, config: Dict, groups: Dict, group_list: List[str]) -> str:
+        """Remove a group from a list by number or name."""
+        if not rest:
+            return f"❌ Bitte geben Sie eine Nummer oder Gruppennamen an.\n\nBeispiel: `/{list_type} remove 1`"
+        
+        # A number selects by position, anything else is matched as a name
+        first = _split_first(rest)[0]
+        if _is_int(first):
+            index = int(first) - 1
+            if 0 <= index < len(group_list):
+                removed_group = group_list.pop(index)
+                self._removed(list_type, group_list, removed_group)
+                await self.save_config(config, 'groups')
+                return f"✅ Gruppe `{removed_group}` von {list_type} entfernt."
+            else:
+                return f"❌ Ungültige Nummer. Verwenden Sie 1-{len(group_list)}."
+        
+        group_name = ' '.join(rest.split())
+        if self._contains(list_type, group_list, group_name):
+            group_list.remove(group_name)
+            self._removed(list_type, group_list, group_name)
+            await self.save_config(config, 'groups')
+            return f"✅ Gruppe `{group_name}` von {list_type} entfernt."
         else:
-            return f"❌ Unbekannte Aktion: {action}\n\nVerfügbare Aktionen: add, remove, list, clear"
+            return f"❌ Gruppe `{group_name}` nicht in {list_type} gefunden."
+    
+    async def _group_clear(self, list_type: str, rest: str, config: Dict, groups: Dict, group_list: List[str]) -> str:
+        """Remove all groups from a list."""
+        count = len(group_list)
+        if count == 0:
+            return f"❌ {list_type.capitalize()} ist bereits leer."
+        
+        groups[list_type] = []
+        self._member_sets[list_type] = set()
+        await self.save_config(config, 'groups')
+        
+        return f"✅ {list_type.capitalize()} geleert ({count} Gruppen entfernt)."
     
-    async def manage_duplicates(self, args: List[str]) -> str:
+    async def manage_duplicates(self, arg_text: str) -> str:
         """Manage duplicate detection settings."""
-        if not args:
-            config = self.load_config()
+        if not arg_text:
+            config = await self.load_config()
             dup_config = config.get('duplicate_detection', {})
             
             enabled = dup_config.get('enabled', True)
             hours = dup_config.get('expiry_hours', 24)
             include_sender = dup_config.get('include_sender', True)
             
-            response = "🔄 **Duplikat-Erkennung Einstellungen:**\n\n"
-            response += f"Status: {'✅ Aktiviert' if enabled else '❌ Deaktiviert'}\n"
-            response += f"Hash-Gültigkeit: {hours} Stunden\n"
-            response += f"Absender berücksichtigen: {'Ja' if include_sender else 'Nein'}\n\n"
-            response += "**Verfügbare Befehle:**\n"
-            response += "• `/duplicates on` - Duplikat-Erkennung aktivieren\n"
-            response += "• `/duplicates off` - Duplikat-Erkennung deaktivieren\n"
-            response += "• `/duplicates hours <zahl>` - Hash-Gültigkeit setzen\n"
-            response += "• `/duplicates sender on/off` - Absender-Berücksichtigung\n"
-            
-            return response
-        
-        action = args[0].lower()
-        config = self.load_config()
-        
-        if 'duplicate_detection' not in config:
-            config['duplicate_detection'] = {
-                'enabled': True,
-                'expiry_hours': 24,
-                'include_sender': True
-            }
-        
-        dup_config = config['duplicate_detection']
-        
-        if action == 'on':
-            dup_config['enabled'] = True
-            config['duplicate_detection'] = dup_config
-            self.save_config(config)
-            return "✅ Duplikat-Erkennung aktiviert."
-        
-        elif action == 'off':
-            dup_config['enabled'] = False
-            config['duplicate_detection'] = dup_config
-            self.save_config(config)
-            return "❌ Duplikat-Erkennung deaktiviert."
-        
-        elif action == 'hours':
-            if len(args) < 2:
-                return "❌ Bitte geben Sie die Anzahl Stunden an.\n\nBeispiel: `/duplicates hours 12`"
-            
-            try:
-                hours = int(args[1])
-                if hours < 1 or hours > 168:  # 1 hour to 1 week
-                    return "❌ Stunden müssen zwischen 1 und 168 (1 Woche) liegen."
-                
-                dup_config['expiry_hours'] = hours
-                config['duplicate_detection'] = dup_config
-                self.save_config(config)
-                return f"✅ Hash-Gültigkeit auf {hours} Stunden gesetzt."
-                
-            except ValueError:
-                return "❌ Ungültige Zahl. Beispiel: `/duplicates hours 12`"
-        
-        elif action == 'sender':
-            if len(args) < 2:
-                return "❌ Bitte geben Sie on oder off an.\n\nBeispiel: `/duplicates sender off`"
-            
-            sender_action = args[1].lower()
-            if sender_action == 'on':
-                dup_config['include_sender'] = True
-                config['duplicate_detection'] = dup_config
-                self.save_config(config)
-                return "✅ Absender wird bei Duplikat-Erkennung berücksichtigt."
-            elif sender_action == 'off':
-                dup_config['include_sender'] = False
-                config['duplicate_detection'] = dup_config
-                self.save_config(config)
-                return "❌ Absender wird bei Duplikat-Erkennung ignoriert."
-            else:
-                return "❌ Verwenden Sie 'on' oder 'off'.\n\nBeispiel: `/duplicates sender off`"
+            return _DUPLICATES_TEMPLATE.format(
+                status='✅ Aktiviert' if enabled else '❌ Deaktiviert',
+                hours=hours,
+                sender=_YESNO[bool(include_sender)]
+            )
+        
+        action, rest = _split_first(arg_text)
+        action = action.lower()
+        handler = self._DUP_ACTIONS.get(action)
+        if handler is None:
+            return f"❌ Unbekannte Aktion: {action}{_DUP_ACTIONS_SUFFIX}"
+        return await handler(self, rest)
+    
+    async def _dup_on(self, rest: str) -> str:
+        """Enable duplicate detection."""
+        await self._update_dup(enabled=True)
+        return "✅ Duplikat-Erkennung aktiviert."
+    
+    async def _dup_off(self, rest: str) -> str:
+        """Disable duplicate detection."""
+        await self._update_dup(enabled=False)
+        return "❌ Duplikat-Erkennung deaktiviert."
+    
+    async def _dup_hours(self, rest: str) -> str:
+        """Set how long message hashes stay valid."""
+        if not rest:
+            return "❌ Bitte geben Sie die Anzahl Stunden an.\n\nBeispiel: `/duplicates hours 12`"
         
-        elif action == 'debug':
-            return await self.debug_duplicates(args[1:])
+        first = _split_first(rest)[0]
+        if not _is_int(first):
+            return "❌ Ungültige Zahl. Beispiel: `/duplicates hours 12`"
         
-        elif action == 'clear':
-            response = "🗑️ **Hash-Speicher leeren:**\n\n"
-            response += "Um alle gespeicherten Message-Hashes zu löschen,\n"
-            response += "starten Sie den Container neu:\n\n"
-            response += "`docker-compose restart telegram-monitor`\n\n"
-            response += "⚠️ **Warnung:** Danach werden alle Nachrichten als 'neu' behandelt!"
-            return response
+        hours = int(first)
+        if hours < 1 or hours > 168:  # 1 hour to 1 week
+            return "❌ Stunden müssen zwischen 1 und 168 (1 Woche) liegen."
         
+        await self._update_dup(expiry_hours=hours)
+        return f"✅ Hash-Gültigkeit auf {hours} Stunden gesetzt."
+    
+    async def _dup_sender(self, rest: str) -> str:
+        """Choose whether the sender is part of the message hash."""
+        if not rest:
+            return "❌ Bitte geben Sie on oder off an.\n\nBeispiel: `/duplicates sender off`"
+        
+        sender_action = _split_first(rest)[0].lower()
+        if sender_action == 'on':
+            await self._update_dup(include_sender=True)
+            return "✅ Absender wird bei Duplikat-Erkennung berücksichtigt."
+        elif sender_action == 'off':
+            await self._update_dup(include_sender=False)
+            return "❌ Absender wird bei Duplikat-Erkennung ignoriert."
         else:
-            return f"❌ Unbekannte Aktion: {action}\n\nVerfügbare Aktionen: on, off, hours, sender, debug, clear"
+            return "❌ Verwenden Sie 'on' oder 'off'.\n\nBeispiel: `/duplicates sender off`"
+    
+    async def _dup_clear(self, rest: str) -> str:
+        """Explain how to clear the hash store."""
+        return _HASH_CLEAR_TEXT
     
-    async def debug_duplicates(self, args: List[str]) -> str:
+    async def _update_dup(self, **settings) -> None:
+        """Change duplicate detection settings and save the config."""
+        config = await self.load_config()
+        config.setdefault('duplicate_detection', dict(_DEFAULT_DUP)).update(settings)
+        await self.save_config(config, 'duplicate_detection')
+    
+    async def debug_duplicates(self, arg_text: str) -> str:
         """Debug duplicate detection system."""
-        if not args:
-            return """🔧 **Duplikat-Debug Befehle:**
-
-• `/duplicates debug status` - Zeige Debug-Informationen
-• `/duplicates debug clear` - Lösche alle gespeicherten Hashes
-• `/duplicates debug test` - Teste Hash-Generierung
-
-**Beispiel:** `/duplicates debug status`"""
+        if not arg_text:
+            return _DEBUG_HELP
         
-        action = args[0].lower()
+        action = _split_first(arg_text)[0].lower()
         
         if action == 'status':
             # Get current duplicate detection state
-            from main import TelegramKeywordMonitor
-            
-            response = "🔧 **Duplikat-Debug Status:**\n\n"
-            response += f"**Gespeicherte Hashes:** Wird zur Laufzeit angezeigt\n"
-            response += f"**Einstellungen:**\n"
-            
-            config = self.load_config()
+            config = await self.load_config()
             dup_config = config.get('duplicate_detection', {})
-            response += f"- Aktiviert: {'Ja' if dup_config.get('enabled', True) else 'Nein'}\n"
-            response += f"- Gültigkeit: {dup_config.get('expiry_hours', 24)} Stunden\n"
-            response += f"- Absender berücksichtigen: {'Ja' if dup_config.get('include_sender', True) else 'Nein'}\n\n"
-            
-            response += "💡 **Hinweis:** Detaillierte Hash-Informationen werden in den Logs angezeigt.\n"
-            response += "Verwenden Sie `docker-compose logs -f telegram-monitor` um sie zu sehen."
-            
-            return response
+            return _DEBUG_STATUS_TEMPLATE.format(
+                enabled=_YESNO[bool(dup_config.get('enabled', True))],
+                hours=dup_config.get('expiry_hours', 24),
+                sender=_YESNO[bool(dup_config.get('include_sender', True))]
+            )
             
         elif action == 'clear':
-            response = "⚠️ **Hash-Speicher leeren:**\n\n"
-            response += "Dies würde alle gespeicherten Message-Hashes löschen.\n"
-            response += "Danach werden alle Nachrichten als 'neu' behandelt.\n\n"
-            response += "💡 **Hinweis:** Diese Funktion ist nur zur Laufzeit verfügbar.\n"
-            response += "Starten Sie den Container neu um den Hash-Speicher zu leeren:\n"
-            response += "`docker-compose restart telegram-monitor`"
-            
-            return response
+            return _DEBUG_CLEAR_TEXT
             
         elif action == 'test':
-            import hashlib
-            import re
-            
             test_message = "Dies ist eine Test-Nachricht für Hash-Generierung"
-            normalized = re.sub(r'\s+', ' ', test_message.strip().lower())
-            hash_result = hashlib.md5(normalized.encode('utf-8')).hexdigest()
-            
-            response = "🧪 **Hash-Test:**\n\n"
-            response += f"**Original:** `{test_message}`\n"
-            response += f"**Normalisiert:** `{normalized}`\n"
-            response += f"**Hash:** `{hash_result[:16]}...`\n\n"
-            response += "💡 Gleiche Nachrichten erzeugen den gleichen Hash."
+            normalized = normalize_message(test_message)
+            hash_result = hash_message(normalized)
             
-            return response
+            return _HASH_TEST_TEMPLATE.format(
+                original=test_message,
+                normalized=normalized,
+                hash=hash_result.hex()[:16]
+            )
             
         else:
-            return f"❌ Unbekannte Debug-Aktion: {action}\n\nVerfügbare Aktionen: status, clear, test"
+            return f"❌ Unbekannte Debug-Aktion: {action}{_DEBUG_ACTIONS_SUFFIX}"
     
-    async def manage_notification_target(self, args: List[str]) -> str:
+    async def manage_notification_target(self, arg_text: str) -> str:
         """Manage notification target settings."""
-        if not args:
-            config = self.load_config()
+        if not arg_text:
+            config = await self.load_config()
             current_target = config.get('telegram', {}).get('notification_target', 'me')
             
-            response = "📬 **Benachrichtigungs-Ziel Verwaltung:**\n\n"
-            response += f"**Aktuelles Ziel:** `{current_target}`\n\n"
-            response += "**Verfügbare Befehle:**\n"
-            response += "• `/target set me` - Saved Messages verwenden\n"
-            response += "• `/target set @channel_name` - Öffentlichen Kanal verwenden\n"
-            response += "• `/target set -1001234567890` - Chat-ID verwenden\n"
-            response += "• `/target set https://t.me/+xxxxx` - Privaten Kanal per Invite-Link\n"
-            response += "• `/target test` - Test-Nachricht senden\n"
-            response += "• `/target check <ziel>` - Ziel-Berechtigung prüfen\n\n"
-            response += "**Hinweise:**\n"
-            response += "- Für Kanäle: Erstellen Sie einen Kanal und fügen Sie sich selbst als Admin hinzu\n"
-            response += "- Für Gruppen: Verwenden Sie die Chat-ID (negative Zahl)\n"
-            response += "- 'me' = Ihre Saved Messages (Standard)\n"
-            response += "- Bei Chat-IDs: Stellen Sie sicher, dass Sie Schreibrechte haben\n\n"
-            response += "**Troubleshooting:**\n"
-            response += "- Kanal-ID funktioniert nicht? Versuchen Sie @username\n"
-            response += "- Keine Berechtigung? Prüfen Sie Admin-Rechte im Kanal\n"
-            response += "- Immer noch Probleme? Verwenden Sie 'me' als Fallback"
-            
-            return response
+            return _TARGET_HELP_TEMPLATE.format(target=current_target)
         
-        action = args[0].lower()
+        action, rest = _split_first(arg_text)
+        action = action.lower()
         
         if action == 'set':
-            if len(args) < 2:
+            if not rest:
                 return "❌ Bitte geben Sie ein Ziel an.\n\nBeispiel: `/target set @my_channel`"
             
-            new_target = args[1]
+            new_target = _split_first(rest)[0]
             
             # Validate target format
             is_invite_link = new_target.startswith('https://t.me/+') or new_target.startswith('t.me/+') or new_target.startswith('+')
@@ -508,7 +815,7 @@ class KeywordManager:
             if not is_valid:
                 return "❌ Ungültiges Ziel-Format.\n\nVerwenden Sie:\n- 'me'\n- '@channel_name'\n- '-1001234567890'\n- 'https://t.me/+xxxxx'"
             
-            config = self.load_config()
+            config = await self.load_config()
             if 'telegram' not in config:
                 config['telegram'] = {}
             
@@ -517,45 +824,38 @@ class KeywordManager:
                 return await self.handle_invite_link(new_target, config)
             else:
                 config['telegram']['notification_target'] = new_target
-                self.save_config(config)
+                await self.save_config(config, 'telegram')
                 
                 return f"✅ Benachrichtigungs-Ziel auf `{new_target}` gesetzt.\n\nVerwenden Sie `/target test` um es zu testen."
         
         elif action == 'test':
-            config = self.load_config()
+            config = await self.load_config()
             target = config.get('telegram', {}).get('notification_target', 'me')
             
             # Try to send a test message to verify the target works
             try:
                 # This will be handled by the main app, we just return the test message
-                response = f"🧪 **Test-Nachricht für Ziel: `{target}`**\n\n"
-                response += "Wenn Sie diese Nachricht erhalten, funktioniert das Benachrichtigungs-Ziel korrekt!\n\n"
-                response += f"**Ziel:** {target}\n"
-                response += f"**Zeit:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-                response += "💡 **Hinweis:** Wenn Sie diese Nachricht nicht im konfigurierten Ziel sehen,\n"
-                response += "überprüfen Sie die Berechtigungen oder verwenden Sie einen anderen Ziel-Typ."
-                
-                return response
+                return _TARGET_TEST_TEMPLATE.format(
+                    target=target,
+                    time=_now_str()
+                )
             except Exception as e:
                 return f"❌ Fehler beim Testen des Ziels `{target}`: {str(e)}"
         
         elif action == 'check':
-            if len(args) < 2:
+            if not rest:
                 return "❌ Bitte geben Sie ein Ziel zum Prüfen an.\n\nBeispiel: `/target check -1002153150590`"
             
-            target_to_check = args[1]
+            target_to_check = _split_first(rest)[0]
             
-            response = f"🔍 **Ziel-Prüfung für: `{target_to_check}`**\n\n"
-            response += "**Wird geprüft...**\n"
-            response += f"- Format: {'Chat-ID' if target_to_check.lstrip('-').isdigit() else 'Username/Text'}\n"
-            response += f"- Typ: {'Kanal/Gruppe' if target_to_check.startswith('-') else 'Benutzer/Kanal'}\n\n"
-            response += "💡 **Hinweis:** Detaillierte Prüfung wird in den Logs angezeigt.\n"
-            response += "Verwenden Sie `docker-compose logs -f telegram-monitor` um Details zu sehen."
-            
-            return response
+            return _TARGET_CHECK_TEMPLATE.format(
+                target=target_to_check,
+                format='Chat-ID' if target_to_check.lstrip('-').isdigit() else 'Username/Text',
+                kind='Kanal/Gruppe' if target_to_check.startswith('-') else 'Benutzer/Kanal'
+            )
         
         else:
-            return f"❌ Unbekannte Aktion: {action}\n\nVerfügbare Aktionen: set, test, check"
+            return f"❌ Unbekannte Aktion: {action}{_TARGET_ACTIONS_SUFFIX}"
     
     async def handle_invite_link(self, invite_link: str, config: Dict) -> str:
         """Handle setting notification target via invite link."""
@@ -575,55 +875,47 @@ class KeywordManager:
             config['telegram']['invite_hash'] = invite_hash
             config['telegram']['needs_join'] = True
             
-            self.save_config(config)
-            
-            response = f"✅ **Invite-Link gespeichert!**\n\n"
-            response += f"**Link:** `{invite_link}`\n"
-            response += f"**Hash:** `{invite_hash}`\n\n"
-            response += "🔄 **Nächste Schritte:**\n"
-            response += "1. Der Monitor wird automatisch dem Kanal beitreten\n"
-            response += "2. Verwenden Sie `/target test` zum Testen\n"
-            response += "3. Bei Problemen wird automatisch zu 'me' gewechselt\n\n"
-            response += "💡 **Hinweis:** Der private Kanal wird beim nächsten Start automatisch verbunden."
+            await self.save_config(config, 'telegram')
             
-            return response
+            return _INVITE_SAVED_TEMPLATE.format(link=invite_link, hash=invite_hash)
             
         except Exception as e:
             return f"❌ Fehler beim Verarbeiten des Invite-Links: {str(e)}"
     
     def show_help(self) -> str:
         """Show help message."""
-        return """🤖 **Telegram Keyword Monitor - Befehle:**
-
-**Keywords verwalten:**
-• `/keywords` - Alle Keywords anzeigen
-• `/add <keyword>` - Keyword hinzufügen
-• `/remove <nummer|keyword>` - Keyword entfernen
-• `/clear` - Alle Keywords löschen
-
-**Gruppen verwalten:**
-• `/groups` - Gruppen-Verwaltung Hilfe
-• `/whitelist <action>` - Whitelist verwalten
-• `/blacklist <action>` - Blacklist verwalten
-
-**Duplikat-Erkennung:**
-• `/duplicates` - Duplikat-Einstellungen anzeigen
-• `/duplicates on/off` - Duplikat-Erkennung ein/ausschalten
-• `/duplicates hours <zahl>` - Hash-Gültigkeit setzen
-
-**Benachrichtigungen:**
-• `/target` - Benachrichtigungs-Ziel verwalten
-• `/target set @channel` - Kanal für Benachrichtigungen setzen
-• `/target test` - Test-Nachricht senden
-
-**Status & Info:**
-• `/status` - Monitor-Status anzeigen
-• `/help` - Diese Hilfe anzeigen
-
-**Beispiele:**
-• `/add python` - Einfaches Keyword
-• `/add (?i)machine learning` - Regex (case-insensitive)
-• `/remove 1` - Erstes Keyword entfernen
-• `/whitelist add Python Jobs` - Gruppe zur Whitelist
-
-💡 **Hinweis:** Alle Befehle funktionieren nur in Ihren "Saved Messages"."""
\ No newline at end of file
+        return _HELP_TEXT
+    
+    # Command -> (handler function, is_async); async handlers take the argument text.
+    # Built once with the class and read-only.
+    _COMMANDS = MappingProxyType({
+        '/keywords': (list_keywords, True),
+        '/add': (add_keyword, True),
+        '/remove': (remove_keyword, True),
+        '/clear': (clear_keywords, True),
+        '/status': (show_status, True),
+        '/groups': (manage_groups, True),
+        '/whitelist': (manage_whitelist, True),
+        '/blacklist': (manage_blacklist, True),
+        '/duplicates': (manage_duplicates, True),
+        '/target': (manage_notification_target, True),
+        '/help': (show_help, False)
+    })
+    
+    # /duplicates action -> handler function taking the remaining text
+    _DUP_ACTIONS = MappingProxyType({
+        'on': _dup_on,
+        'off': _dup_off,
+        'hours': _dup_hours,
+        'sender': _dup_sender,
+        'debug': debug_duplicates,
+        'clear': _dup_clear
+    })
+    
+    # /whitelist and /blacklist action -> handler function
+    _GROUP_ACTIONS = MappingProxyType({
+        'list': _group_list,
+        'add': _group_add,
+        'remove': _group_remove,
+        'clear': _group_clear
+    })
\ No newline at end of file
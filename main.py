@@ -5,40 +5,109 @@ Monitors all Telegram groups for specified keywords and sends notifications to S
 """
 
 import asyncio
+import atexit
 import json
 import logging
+import logging.handlers
+import queue
 import re
 import sys
-import hashlib
-from datetime import datetime, timedelta
-from typing import List, Dict
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
 
 from telethon import TelegramClient, events
 from telethon.tl.types import MessageService, PeerUser
 from telethon.tl.functions.messages import ImportChatInviteRequest
 
-from keyword_manager import KeywordManager
+from keyword_manager import KeywordManager, compile_regex, is_regex_keyword, normalize_message, hash_message
 
 
 class TelegramKeywordMonitor:
+    # Message attribute -> label shown in notifications, in display order
+    _MEDIA_ATTRS = (
+        ('photo', "📷 Photo"),
+        ('video', "🎥 Video"),
+        ('document', "📄 Document"),
+        ('sticker', "🎭 Sticker"),
+        ('voice', "🎤 Voice"),
+        ('video_note', "📹 Video Note"),
+        ('audio', "🎵 Audio"),
+    )
+    
+    # Telegram's limit for the text of a single message
+    MAX_MESSAGE_LENGTH = 4096
+    # Seconds the notification worker waits to collect a burst of matches
+    NOTIFY_BATCH_DELAY = 1.0
+    # Seconds shutdown waits for queued notifications to go out
+    NOTIFY_DRAIN_TIMEOUT = 10.0
+    # Put between text notifications that are sent as one message
+    NOTIFY_SEPARATOR = "\n\n---\n\n"
+    # Seconds a notification target check is reused before asking Telegram again
+    TARGET_CHECK_TTL = 600
+    # Seconds a resolved chat title or sender name is reused, and how many of each are kept
+    NAME_CACHE_TTL = 3600
+    NAME_CACHE_SIZE = 4096
+    
     def __init__(self, config_path: str = "config.json"):
         """Initialize the Telegram Keyword Monitor."""
         self.config_path = config_path
         self.config = self.load_config()
         self.client = None
+        # Our own user, resolved once after login
+        self._me = None
+        self._my_id = None
         self.keyword_manager = KeywordManager(config_path)
         self.setup_logging()
         
         # Duplicate detection
-        self.message_hashes: Dict[str, datetime] = {}
+        # Hash -> time.monotonic() when it was stored; insertion order is age
+        # order, so expired hashes are always at the front
+        self.message_hashes: 'OrderedDict[bytes, float]' = OrderedDict()
         self.cleanup_interval = 3600  # Clean up old hashes every hour
         
         # Load duplicate detection settings
         dup_config = self.config.get('duplicate_detection', {})
         self.duplicate_detection_enabled = dup_config.get('enabled', True)
         self.hash_expiry_hours = dup_config.get('expiry_hours', 24)
+        self._expiry_seconds = self.hash_expiry_hours * 3600.0
         self.include_sender_in_hash = dup_config.get('include_sender', True)
         
+        # Lookup structures derived from the config, and the keyword manager's
+        # config version they were built from
+        self._config_version = -1
+        self._channel_access_done = False
+        self._case_sensitive = False
+        # (keyword, folded text, None) for plain keywords, (keyword, None, pattern) for regexes
+        self._keyword_table: List[Tuple[str, Optional[str], Optional[re.Pattern]]] = []
+        # Just the regex entries, for messages that contain no plain keyword
+        self._regex_keywords: List[Tuple[str, re.Pattern]] = []
+        self._literal_prefilter = None
+        self._min_literal_len = 0
+        self._whitelist_ids = frozenset()
+        self._whitelist_titles = frozenset()
+        self._blacklist_ids = frozenset()
+        self._blacklist_titles = frozenset()
+        self._apply_config()
+        
+        # Chat ID -> chat part of its message links
+        self._link_prefixes: Dict[int, str] = {}
+        # Chat ID -> (title, time.monotonic() when resolved), and the same for sender names
+        self._chat_titles: Dict[int, Tuple[str, float]] = {}
+        self._sender_names: Dict[int, Tuple[str, float]] = {}
+        
+        # Notifications waiting to be sent: (text, media message to forward or None,
+        # description for the log), drained by the notification worker
+        self._notify_queue: asyncio.Queue = asyncio.Queue()
+        self._notify_worker: Optional[asyncio.Task] = None
+        # Notification target -> (check result, time.monotonic() of the check)
+        self._target_checks: Dict[str, Tuple[bool, float]] = {}
+        # Notification target the fallbacks and entity ID below belong to
+        self._notify_target: Optional[str] = None
+        self._notify_fallbacks: list = []
+        self._target_entity_id = None
+        
     def load_config(self) -> Dict:
         """Load configuration from JSON file."""
         try:
@@ -64,6 +133,7 @@ class TelegramKeywordMonitor:
     
     def setup_logging(self):
         """Setup logging configuration."""
+        self._log_listener = None
         log_config = self.config.get('logging', {})
         if not log_config.get('enabled', True):
             return
@@ -90,14 +160,40 @@ class TelegramKeywordMonitor:
         except PermissionError:
             logging.warning(f"Cannot write to log file {log_file}, using console logging only")
         
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=handlers
-        )
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        # Logging calls only enqueue the record; a background thread does the
+        # console and file writes so disk latency stays off the event loop
+        log_queue = queue.Queue(-1)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        logging.basicConfig(level=log_level, handlers=[queue_handler])
+        
+        self._log_queue_handler = queue_handler
+        self._log_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        self._log_listener.start()
+        # Also covers the sys.exit() calls on startup errors, whose last record
+        # would otherwise still sit in the queue when the process ends
+        atexit.register(self._stop_logging)
         
         logging.info("Telegram Keyword Monitor started")
     
+    def _stop_logging(self):
+        """Write out the queued log records and log directly from here on."""
+        listener = self._log_listener
+        if listener is None:
+            return
+        self._log_listener = None
+        listener.stop()
+        
+        # Records logged after shutdown, like main()'s fatal error, skip the queue
+        root = logging.getLogger()
+        root.removeHandler(self._log_queue_handler)
+        for handler in listener.handlers:
+            root.addHandler(handler)
+    
     async def initialize_client(self):
         """Initialize and connect the Telegram client."""
         telegram_config = self.config['telegram']
@@ -120,70 +216,128 @@ class TelegramKeywordMonitor:
         try:
             await self.client.start()
             me = await self.client.get_me()
+            self._me = me
+            self._my_id = me.id
             logging.info(f"Successfully logged in as {me.first_name} (@{me.username})")
             
         except Exception as e:
             logging.error(f"Failed to connect to Telegram: {e}")
             sys.exit(1)
     
-    def check_group_filters(self, chat_id: int, chat_title: str) -> bool:
-        """Check if the group should be monitored based on whitelist/blacklist."""
+    def _build_group_filters(self):
+        """Index the whitelist and blacklist entries by chat ID and by lowercased title."""
         groups_config = self.config.get('groups', {})
         whitelist = groups_config.get('whitelist', [])
         blacklist = groups_config.get('blacklist', [])
         
+        self._whitelist_ids = frozenset(whitelist)
+        self._whitelist_titles = frozenset(w.lower() for w in whitelist)
+        self._blacklist_ids = frozenset(blacklist)
+        self._blacklist_titles = frozenset(b.lower() for b in blacklist)
+    
+    def check_group_filters(self, chat_id: int, chat_title: str) -> bool:
+        """Check if the group should be monitored based on whitelist/blacklist."""
         # If whitelist is specified, only monitor whitelisted groups
-        if whitelist:
-            return any(
-                str(chat_id) in whitelist or 
-                chat_title.lower() in [w.lower() for w in whitelist]
-                for w in whitelist
-            )
+        if self._whitelist_ids:
+            return str(chat_id) in self._whitelist_ids or chat_title.lower() in self._whitelist_titles
         
         # If blacklist is specified, exclude blacklisted groups
-        if blacklist:
-            return not any(
-                str(chat_id) in blacklist or 
-                chat_title.lower() in [b.lower() for b in blacklist]
-                for b in blacklist
-            )
+        if self._blacklist_ids:
+            return not (str(chat_id) in self._blacklist_ids or chat_title.lower() in self._blacklist_titles)
         
         # If no filters, monitor all groups
         return True
     
+    def _apply_config(self):
+        """Rebuild the lookup structures derived from self.config after it changed."""
+        self._build_keyword_table()
+        self._build_group_filters()
+        # A command may have stored a new invite link to join
+        self._channel_access_done = False
+    
+    def _build_keyword_table(self):
+        """Classify, case-fold and compile the keywords once instead of for every message."""
+        keywords = self.config.get('keywords', [])
+        case_sensitive = self.config.get('settings', {}).get('case_sensitive', False)
+        flags = 0 if case_sensitive else re.IGNORECASE
+        
+        table = []
+        literals = set()
+        for keyword in keywords:
+            # Check if keyword is a regex pattern
+            if is_regex_keyword(keyword):
+                try:
+                    table.append((keyword, None, compile_regex(keyword, flags)))
+                except re.error as e:
+                    # Reported once here, then left out of matching
+                    logging.warning(f"Invalid regex pattern '{keyword}': {e}")
+            else:
+                folded = keyword if case_sensitive else keyword.casefold()
+                table.append((keyword, folded, None))
+                literals.add(folded)
+        
+        self._case_sensitive = case_sensitive
+        self._keyword_table = table
+        self._regex_keywords = [(keyword, pattern) for keyword, _, pattern in table if pattern is not None]
+        
+        # Fuse all plain keywords into one pattern that tells whether any of them occurs
+        if literals:
+            self._literal_prefilter = re.compile('|'.join(re.escape(literal) for literal in sorted(literals)))
+            # Texts shorter than the shortest plain keyword cannot contain any of them
+            self._min_literal_len = min(len(literal) for literal in literals)
+        else:
+            self._literal_prefilter = None
+            self._min_literal_len = 0
+    
     def check_keywords(self, message_text: str) -> List[str]:
         """Check if message contains any keywords."""
         if not message_text:
             return []
         
-        keywords = self.config.get('keywords', [])
-        case_sensitive = self.config.get('settings', {}).get('case_sensitive', False)
-        found_keywords = []
+        # One scan over the message rules out all plain keywords for most messages;
+        # then only the regexes are left to try, or nothing at all
+        prefilter = self._literal_prefilter
+        if prefilter is None:
+            return [keyword for keyword, pattern in self._regex_keywords if pattern.search(message_text)]
         
-        for keyword in keywords:
-            try:
-                # Check if keyword is a regex pattern
-                if keyword.startswith('(?i)') or '(' in keyword or '[' in keyword:
-                    # Treat as regex
-                    flags = 0 if case_sensitive else re.IGNORECASE
-                    if re.search(keyword, message_text, flags):
-                        found_keywords.append(keyword)
-                else:
-                    # Treat as simple string
-                    text_to_search = message_text if case_sensitive else message_text.lower()
-                    keyword_to_search = keyword if case_sensitive else keyword.lower()
-                    
-                    if keyword_to_search in text_to_search:
-                        found_keywords.append(keyword)
-                        
-            except re.error as e:
-                logging.warning(f"Invalid regex pattern '{keyword}': {e}")
-                continue
+        # Case-fold the message once for all plain keywords; casefold() unlike lower()
+        # also matches 'Straße' against 'strasse'
+        text_to_search = message_text if self._case_sensitive else message_text.casefold()
+        if len(text_to_search) < self._min_literal_len or prefilter.search(text_to_search) is None:
+            return [keyword for keyword, pattern in self._regex_keywords if pattern.search(message_text)]
+        
+        found_keywords = []
+        for keyword, folded, pattern in self._keyword_table:
+            if pattern is not None:
+                if pattern.search(message_text):
+                    found_keywords.append(keyword)
+            elif folded in text_to_search:
+                found_keywords.append(keyword)
         
         return found_keywords
     
+    def _cached_name(self, cache: Dict[int, Tuple[str, float]], key: Optional[int]) -> Optional[str]:
+        """Name stored for a chat or sender if it was resolved within NAME_CACHE_TTL."""
+        entry = cache.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.NAME_CACHE_TTL:
+            return entry[0]
+        return None
+    
+    def _remember_name(self, cache: Dict[int, Tuple[str, float]], key: Optional[int], name: str):
+        """Store a resolved name, dropping the oldest entry once the cache is full."""
+        if key is None:
+            return
+        cache.pop(key, None)
+        if len(cache) >= self.NAME_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache[key] = (name, time.monotonic())
+    
     async def get_chat_info(self, event) -> tuple:
         """Get chat information from event."""
+        chat_title = self._cached_name(self._chat_titles, event.chat_id)
+        if chat_title is not None:
+            return event.chat_id, chat_title
+        
         try:
             chat = await event.get_chat()
             
@@ -195,6 +349,7 @@ class TelegramKeywordMonitor:
                 chat_title = "Unknown Chat"
             
             chat_id = event.chat_id
+            self._remember_name(self._chat_titles, chat_id, chat_title)
             return chat_id, chat_title
             
         except Exception as e:
@@ -203,6 +358,11 @@ class TelegramKeywordMonitor:
     
     async def get_sender_info(self, event) -> str:
         """Get sender information from event."""
+        sender_id = event.sender_id
+        sender_name = self._cached_name(self._sender_names, sender_id)
+        if sender_name is not None:
+            return sender_name
+        
         try:
             sender = await event.get_sender()
             
@@ -213,6 +373,7 @@ class TelegramKeywordMonitor:
             else:
                 sender_name = "Unknown Sender"
             
+            self._remember_name(self._sender_names, sender_id, sender_name)
             return sender_name
             
         except Exception as e:
@@ -230,56 +391,65 @@ class TelegramKeywordMonitor:
         
         return message_text
     
-    async def send_notification(self, chat_title: str, sender_name: str, 
-                              message_text: str, keywords: List[str], 
-                              chat_id: int, message_id: int, original_message=None):
-        """Send notification to Saved Messages with media support."""
-        try:
-            # Check if we need to join a private channel first
-            await self.ensure_channel_access()
-            # Create message link
+    def _chat_link_prefix(self, chat_id: int) -> str:
+        """Chat part of a t.me/c/ message link, computed once per chat."""
+        prefix = self._link_prefixes.get(chat_id)
+        if prefix is None:
+            chat_id_str = str(chat_id)
             if chat_id < 0:  # Group/Channel
-                if str(chat_id).startswith('-100'):
-                    chat_id_str = str(chat_id)[4:]  # Remove -100 prefix for supergroups
+                if chat_id_str.startswith('-100'):
+                    prefix = chat_id_str[4:]  # Remove -100 prefix for supergroups
                 else:
-                    chat_id_str = str(abs(chat_id))  # Regular groups
-                message_link = f"https://t.me/c/{chat_id_str}/{message_id}"
+                    prefix = chat_id_str[1:]  # Regular groups
             else:  # Private chat
-                message_link = f"https://t.me/c/{chat_id}/{message_id}"
+                prefix = chat_id_str
+            self._link_prefixes[chat_id] = prefix
+        return prefix
+    
+    def _notification_target(self) -> str:
+        """Configured notification target; its other forms are worked out once per target."""
+        target = self.config.get('telegram', {}).get('notification_target', 'me')
+        if target != self._notify_target:
+            self._notify_target = target
+            self._notify_fallbacks = self._fallback_targets(target)
+            # Entity ID of the target chat, resolved on first use; False if it has none
+            self._target_entity_id = None
+        return target
+    
+    @staticmethod
+    def _fallback_targets(target: str) -> list:
+        """Other forms of the target to try when sending to it as configured fails."""
+        if target == 'me':
+            return []
+        if target.lstrip('-').isdigit():
+            # It's a chat ID, try as int
+            return [int(target)]
+        if target.startswith('@'):
+            # It's a username, try without @
+            return [target, target[1:]]
+        # Try both with and without @
+        return [f"@{target}", target]
+    
+    def send_notification(self, chat_title: str, sender_name: str, 
+                          message_text: str, keywords: List[str], 
+                          chat_id: int, message_id: int, original_message=None):
+        """Build a notification and queue it for the notification worker."""
+        try:
+            # Create message link
+            message_link = f"https://t.me/c/{self._chat_link_prefix(chat_id)}/{message_id}"
             
             # Format notification
             formatted_message = self.format_message(message_text)
             keywords_str = ", ".join(keywords)
             
-            # Check if message has media
-            has_media = original_message and (
-                original_message.photo or 
-                original_message.video or 
-                original_message.document or 
-                original_message.sticker or
-                original_message.voice or
-                original_message.video_note or
-                original_message.audio
-            )
+            # Check if message has media, collecting the labels in the same pass
+            media_types = []
+            if original_message:
+                media_types = [label for attr, label in self._MEDIA_ATTRS if getattr(original_message, attr)]
+            has_media = bool(media_types)
             
             media_info = ""
             if has_media:
-                media_types = []
-                if original_message.photo:
-                    media_types.append("📷 Photo")
-                if original_message.video:
-                    media_types.append("🎥 Video")
-                if original_message.document:
-                    media_types.append("📄 Document")
-                if original_message.sticker:
-                    media_types.append("🎭 Sticker")
-                if original_message.voice:
-                    media_types.append("🎤 Voice")
-                if original_message.video_note:
-                    media_types.append("📹 Video Note")
-                if original_message.audio:
-                    media_types.append("🎵 Audio")
-                
                 media_info = f"**Media:** {', '.join(media_types)}\n"
             
             notification = (
@@ -293,91 +463,150 @@ class TelegramKeywordMonitor:
                 f"**Link:** {message_link}"
             )
             
-            # Get notification target from config
-            notification_target = self.config.get('telegram', {}).get('notification_target', 'me')
+            # Media messages are forwarded as they are, everything else goes out as text
+            self._notify_queue.put_nowait((
+                notification,
+                original_message if has_media else None,
+                f"keywords: {keywords_str} in {chat_title}"
+            ))
+            
+        except Exception as e:
+            logging.error(f"Error in send_notification: {e}")
+            # Log the notification content for debugging
+            logging.info(f"Failed notification content: Keywords: {keywords}, Group: {chat_title}, Sender: {sender_name}")
+    
+    async def _notification_worker(self):
+        """Deliver queued notifications, merging the text notifications of a burst."""
+        notify_queue = self._notify_queue
+        while True:
+            jobs = [await notify_queue.get()]
+            # Give a burst a moment to arrive so it goes out in as few messages as possible
+            await asyncio.sleep(self.NOTIFY_BATCH_DELAY)
+            while not notify_queue.empty():
+                jobs.append(notify_queue.get_nowait())
             
-            # Send notification with media if available
             try:
-                # First, try to validate the target
-                await self.validate_notification_target(notification_target)
+                await self._deliver_batch(jobs)
+            except Exception as e:
+                logging.error(f"Error delivering notifications: {e}")
+            finally:
+                for _ in jobs:
+                    notify_queue.task_done()
+    
+    async def _deliver_batch(self, jobs: List[Tuple[str, object, str]]):
+        """Send queued jobs in order, joining consecutive text notifications up to Telegram's length limit."""
+        separator = self.NOTIFY_SEPARATOR
+        texts = []
+        descriptions = []
+        length = 0
+        
+        for notification, media_message, description in jobs:
+            if media_message is None:
+                added = len(notification) + (len(separator) if texts else 0)
+                if not texts or length + added <= self.MAX_MESSAGE_LENGTH:
+                    texts.append(notification)
+                    descriptions.append(description)
+                    length += added
+                    continue
+            
+            # Flush the merged text notifications before anything that does not fit
+            if texts:
+                await self._deliver(separator.join(texts), None, "; ".join(descriptions))
+                texts, descriptions, length = [], [], 0
+            
+            if media_message is None:
+                texts.append(notification)
+                descriptions.append(description)
+                length = len(notification)
+            else:
+                await self._deliver(notification, media_message, description)
+        
+        if texts:
+            await self._deliver(separator.join(texts), None, "; ".join(descriptions))
+    
+    async def _deliver(self, notification: str, media_message, description: str):
+        """Send one notification to the configured target, trying fallbacks if that fails."""
+        # Check if we need to join a private channel first; once per config change
+        if not self._channel_access_done:
+            await self.ensure_channel_access()
+        
+        # Get notification target from config
+        notification_target = self._notification_target()
+        
+        # Send notification with media if available
+        try:
+            # First, try to validate the target
+            await self.validate_notification_target(notification_target)
+            
+            if media_message is not None:
+                # Only forward the original message (with media) - no separate text notification
+                await self.client.forward_messages(notification_target, media_message)
+                logging.info(f"✅ Media forwarded to {notification_target} for {description}")
+            else:
+                # Send text-only notification for messages without media
+                await self.client.send_message(notification_target, notification)
+                logging.info(f"✅ Text notification sent to {notification_target} for {description}")
                 
-                if has_media:
-                    # Only forward the original message (with media) - no separate text notification
-                    await self.client.forward_messages(notification_target, original_message)
-                    logging.info(f"✅ Media forwarded to {notification_target} for keywords: {keywords_str} in {chat_title}")
+        except Exception as e1:
+            logging.warning(f"Failed to send to {notification_target}: {e1}")
+            # Check the target again next time instead of trusting the cached result
+            self._target_checks.pop(notification_target, None)
+            try:
+                # Fallback: Try to resolve target differently
+                if notification_target != 'me':
+                    # If it's a channel/group, try with different formats
+                    success = False
+                    for target in self._notify_fallbacks:
+                        try:
+                            if media_message is not None:
+                                await self.client.forward_messages(target, media_message)
+                                logging.info(f"✅ Media forwarded to {target} for {description}")
+                            else:
+                                await self.client.send_message(target, notification)
+                                logging.info(f"✅ Text notification sent to {target} for {description}")
+                            success = True
+                            break
+                        except Exception as e_fallback:
+                            logging.debug(f"Fallback target {target} failed: {e_fallback}")
+                            continue
+                    
+                    if not success:
+                        raise Exception(f"All fallback targets failed for {notification_target}")
                 else:
-                    # Send text-only notification for messages without media
-                    await self.client.send_message(notification_target, notification)
-                    logging.info(f"✅ Text notification sent to {notification_target} for keywords: {keywords_str} in {chat_title}")
+                    # Fallback to user ID for 'me'
+                    if media_message is not None:
+                        await self.client.forward_messages(self._my_id, media_message)
+                        logging.info(f"✅ Media forwarded to user ID for {description}")
+                    else:
+                        await self.client.send_message(self._my_id, notification)
+                        logging.info(f"✅ Text notification sent to user ID for {description}")
                     
-            except Exception as e1:
-                logging.warning(f"Failed to send to {notification_target}: {e1}")
+            except Exception as e2:
+                logging.warning(f"All fallback methods failed: {e2}")
                 try:
-                    # Fallback: Try to resolve target differently
-                    if notification_target != 'me':
-                        # If it's a channel/group, try with different formats
-                        fallback_targets = []
-                        
-                        if notification_target.lstrip('-').isdigit():
-                            # It's a chat ID, try as int
-                            fallback_targets.append(int(notification_target))
-                        elif notification_target.startswith('@'):
-                            # It's a username, try without @
-                            fallback_targets.append(notification_target)
-                            fallback_targets.append(notification_target[1:])  # Remove @
-                        else:
-                            # Try both with and without @
-                            fallback_targets.append(f"@{notification_target}")
-                            fallback_targets.append(notification_target)
-                        
-                        success = False
-                        for target in fallback_targets:
-                            try:
-                                if has_media:
-                                    await self.client.forward_messages(target, original_message)
-                                    logging.info(f"✅ Media forwarded to {target} for keywords: {keywords_str} in {chat_title}")
-                                else:
-                                    await self.client.send_message(target, notification)
-                                    logging.info(f"✅ Text notification sent to {target} for keywords: {keywords_str} in {chat_title}")
-                                success = True
-                                break
-                            except Exception as e_fallback:
-                                logging.debug(f"Fallback target {target} failed: {e_fallback}")
-                                continue
-                        
-                        if not success:
-                            raise Exception(f"All fallback targets failed for {notification_target}")
-                    else:
-                        # Fallback to user ID for 'me'
-                        me = await self.client.get_me()
-                        if has_media:
-                            await self.client.forward_messages(me.id, original_message)
-                            logging.info(f"✅ Media forwarded to user ID for keywords: {keywords_str} in {chat_title}")
-                        else:
-                            await self.client.send_message(me.id, notification)
-                            logging.info(f"✅ Text notification sent to user ID for keywords: {keywords_str} in {chat_title}")
-                        
-                except Exception as e2:
-                    logging.warning(f"All fallback methods failed: {e2}")
-                    try:
-                        # Final fallback: Send to self via PeerUser
-                        me = await self.client.get_me()
-                        await self.client.send_message(PeerUser(me.id), notification)
-                        logging.info(f"✅ Final fallback text notification sent for keywords: {keywords_str} in {chat_title}")
-                    except Exception as e3:
-                        logging.error(f"❌ All notification methods failed: {e1}, {e2}, {e3}")
-                        # Fallback: Log the notification
-                        logging.info(f"NOTIFICATION: {notification}")
-                        # Don't raise, just continue - we logged the notification
-                        logging.error(f"Target {notification_target} is not accessible. Check permissions or use 'me' as target.")
-            
-        except Exception as e:
-            logging.error(f"Error in send_notification: {e}")
-            # Log the notification content for debugging
-            logging.info(f"Failed notification content: Keywords: {keywords}, Group: {chat_title}, Sender: {sender_name}")
+                    # Final fallback: Send to self via PeerUser
+                    await self.client.send_message(PeerUser(self._my_id), notification)
+                    logging.info(f"✅ Final fallback text notification sent for {description}")
+                except Exception as e3:
+                    logging.error(f"❌ All notification methods failed: {e1}, {e2}, {e3}")
+                    # Fallback: Log the notification
+                    logging.info(f"NOTIFICATION: {notification}")
+                    # Don't raise, just continue - we logged the notification
+                    logging.error(f"Target {notification_target} is not accessible. Check permissions or use 'me' as target.")
     
     async def validate_notification_target(self, target: str):
-        """Validate if we can send messages to the target."""
+        """Validate if we can send messages to the target, reusing a recent result."""
+        now = time.monotonic()
+        cached = self._target_checks.get(target)
+        if cached is not None and now - cached[1] < self.TARGET_CHECK_TTL:
+            return cached[0]
+        
+        result = await self._check_notification_target(target)
+        self._target_checks[target] = (result, now)
+        return result
+    
+    async def _check_notification_target(self, target: str):
+        """Ask Telegram whether we can send messages to the target."""
         try:
             if target == 'me':
                 return True  # Always works
@@ -394,8 +623,7 @@ class TelegramKeywordMonitor:
                 if hasattr(entity, 'megagroup') or hasattr(entity, 'broadcast'):
                     try:
                         # Try to get our participant status
-                        me = await self.client.get_me()
-                        participant = await self.client.get_permissions(entity, me)
+                        participant = await self.client.get_permissions(entity, self._me)
                         logging.debug(f"Permissions in {target}: {participant}")
                         
                         if not participant.send_messages:
@@ -434,13 +662,10 @@ class TelegramKeywordMonitor:
                         channel = result.chats[0]
                         channel_id = f"-100{channel.id}"
                         
-                        # Update config with the actual channel ID
-                        self.config['telegram']['notification_target'] = channel_id
-                        self.config['telegram']['needs_join'] = False
-                        
-                        # Save updated config
-                        with open(self.config_path, 'w', encoding='utf-8') as f:
-                            json.dump(self.config, f, indent=2, ensure_ascii=False)
+                        # Update config with the actual channel ID and save it through
+                        # the keyword manager's batched, atomic write
+                        self.config['telegram'].update(notification_target=channel_id, needs_join=False)
+                        await self.keyword_manager.save_config(self.config, 'telegram')
                         
                         logging.info(f"✅ Successfully joined private channel: {channel.title} ({channel_id})")
                         
@@ -458,11 +683,8 @@ class TelegramKeywordMonitor:
                     logging.error(f"Failed to join private channel: {join_error}")
                     
                     # Fallback to 'me'
-                    self.config['telegram']['notification_target'] = 'me'
-                    self.config['telegram']['needs_join'] = False
-                    
-                    with open(self.config_path, 'w', encoding='utf-8') as f:
-                        json.dump(self.config, f, indent=2, ensure_ascii=False)
+                    self.config['telegram'].update(notification_target='me', needs_join=False)
+                    await self.keyword_manager.save_config(self.config, 'telegram')
                     
                     logging.warning("Falling back to 'me' as notification target")
                     
@@ -478,11 +700,14 @@ class TelegramKeywordMonitor:
                     
         except Exception as e:
             logging.error(f"Error in ensure_channel_access: {e}")
+        
+        # Joined, fell back to 'me' or had nothing to do; a retry would not change that
+        self._channel_access_done = True
     
-    def generate_message_hash(self, message_text: str, sender_id: int = None) -> str:
+    def generate_message_hash(self, message_text: str, sender_id: int = None) -> bytes:
         """Generate a hash for message deduplication."""
         # Normalize message text for better duplicate detection
-        normalized_text = re.sub(r'\s+', ' ', message_text.strip().lower())
+        normalized_text = normalize_message(message_text)
         
         # If message is empty or very short, use a different approach
         if len(normalized_text) < 3:
@@ -493,16 +718,16 @@ class TelegramKeywordMonitor:
         if self.include_sender_in_hash and sender_id:
             hash_input += f"_sender_{sender_id}"
         
-        hash_result = hashlib.md5(hash_input.encode('utf-8')).hexdigest()
+        hash_result = hash_message(hash_input)
         
         # Debug logging
-        logging.debug(f"Generated hash for message: '{normalized_text[:50]}...' -> {hash_result[:8]}...")
+        logging.debug(f"Generated hash for message: '{normalized_text[:50]}...' -> {hash_result.hex()[:8]}...")
         
         return hash_result
     
-    def is_duplicate_message(self, message_hash: str) -> bool:
+    def is_duplicate_message(self, message_hash: bytes) -> bool:
         """Check if message is a duplicate and update tracking."""
-        current_time = datetime.now()
+        current_time = time.monotonic()
         
         # Clean up old hashes periodically
         if len(self.message_hashes) > 1000:  # Prevent memory buildup
@@ -510,34 +735,36 @@ class TelegramKeywordMonitor:
         
         # Check if hash exists and is still valid
         if message_hash in self.message_hashes:
-            hash_time = self.message_hashes[message_hash]
-            if current_time - hash_time < timedelta(hours=self.hash_expiry_hours):
-                logging.debug(f"Duplicate detected: {message_hash[:8]}... (age: {current_time - hash_time})")
+            age = current_time - self.message_hashes[message_hash]
+            if age < self._expiry_seconds:
+                logging.debug(f"Duplicate detected: {message_hash.hex()[:8]}... (age: {age:.0f}s)")
                 return True  # Duplicate found
             else:
                 # Hash expired, remove it
-                logging.debug(f"Hash expired, removing: {message_hash[:8]}...")
+                logging.debug(f"Hash expired, removing: {message_hash.hex()[:8]}...")
                 del self.message_hashes[message_hash]
         
         # Add new hash
         self.message_hashes[message_hash] = current_time
-        logging.debug(f"New message hash stored: {message_hash[:8]}... (total hashes: {len(self.message_hashes)})")
+        logging.debug(f"New message hash stored: {message_hash.hex()[:8]}... (total hashes: {len(self.message_hashes)})")
         return False  # Not a duplicate
     
     def cleanup_old_hashes(self):
         """Remove expired message hashes."""
-        current_time = datetime.now()
-        expired_hashes = []
-        
-        for message_hash, timestamp in self.message_hashes.items():
-            if current_time - timestamp > timedelta(hours=self.hash_expiry_hours):
-                expired_hashes.append(message_hash)
-        
-        for hash_to_remove in expired_hashes:
-            del self.message_hashes[hash_to_remove]
-        
-        if expired_hashes:
-            logging.info(f"Cleaned up {len(expired_hashes)} expired message hashes")
+        cutoff = time.monotonic() - self._expiry_seconds
+        message_hashes = self.message_hashes
+        removed = 0
+        
+        # Stop at the first hash that is still valid, everything after it is newer
+        while message_hashes:
+            oldest_hash, timestamp = next(iter(message_hashes.items()))
+            if timestamp >= cutoff:
+                break
+            message_hashes.popitem(last=False)
+            removed += 1
+        
+        if removed:
+            logging.info(f"Cleaned up {removed} expired message hashes")
     
     async def message_handler(self, event):
         """Handle incoming messages."""
@@ -551,55 +778,58 @@ class TelegramKeywordMonitor:
             if not message_text:
                 return
             
-            # Get chat and sender info
-            chat_id, chat_title = await self.get_chat_info(event)
+            chat_id = event.chat_id
             
             # Check if this is a command in notification target or self-chat
-            me = await self.client.get_me()
-            notification_target = self.config.get('telegram', {}).get('notification_target', 'me')
+            notification_target = self._notification_target()
             
             # Handle commands in self-chat or notification target
             is_command_chat = False
-            if chat_id == me.id:  # Self-chat (Saved Messages)
+            if chat_id == self._my_id:  # Self-chat (Saved Messages)
                 is_command_chat = True
             elif notification_target != 'me':
-                # Check if this is the notification target chat
-                try:
-                    target_entity = await self.client.get_entity(notification_target)
-                    if hasattr(target_entity, 'id') and target_entity.id == chat_id:
-                        is_command_chat = True
-                except Exception:
-                    pass
+                # Check if this is the notification target chat, resolved once per target
+                if self._target_entity_id is None:
+                    try:
+                        target_entity = await self.client.get_entity(notification_target)
+                        self._target_entity_id = getattr(target_entity, 'id', False)
+                    except Exception:
+                        pass
+                if self._target_entity_id == chat_id:
+                    is_command_chat = True
             
             if is_command_chat:
                 await self.handle_command(event, message_text)
                 return
             
-            # Check group filters
-            if not self.check_group_filters(chat_id, chat_title):
-                return
-            
-            # Check for keywords
+            # Check for keywords first: most messages match none, and those never
+            # need their chat resolved
             found_keywords = self.check_keywords(message_text)
             if not found_keywords:
                 return
             
+            # Get chat info and check group filters
+            chat_id, chat_title = await self.get_chat_info(event)
+            if not self.check_group_filters(chat_id, chat_title):
+                return
+            
             # Check for duplicates (if enabled)
             if self.duplicate_detection_enabled:
                 sender_id = event.sender_id if hasattr(event, 'sender_id') else None
                 message_hash = self.generate_message_hash(message_text, sender_id)
                 
                 if self.is_duplicate_message(message_hash):
-                    logging.info(f"🔄 Duplicate message detected in {chat_title} from {sender_id}, skipping notification (hash: {message_hash[:8]}...)")
+                    logging.info(f"🔄 Duplicate message detected in {chat_title} from {sender_id}, skipping notification (hash: {message_hash.hex()[:8]}...)")
                     return
                 else:
-                    logging.debug(f"✅ New unique message in {chat_title} (hash: {message_hash[:8]}...)")
+                    logging.debug(f"✅ New unique message in {chat_title} (hash: {message_hash.hex()[:8]}...)")
             
             # Get sender info
             sender_name = await self.get_sender_info(event)
             
-            # Send notification with original message for media support
-            await self.send_notification(
+            # Queue notification with original message for media support; the
+            # worker sends it so the next update does not wait for Telegram's replies
+            self.send_notification(
                 chat_title=chat_title,
                 sender_name=sender_name,
                 message_text=message_text,
@@ -623,8 +853,14 @@ class TelegramKeywordMonitor:
             # Process command
             response = await self.keyword_manager.process_command(message_text)
             
-            # Reload config after potential changes
-            self.config = self.load_config()
+            # Pick up changes from the keyword manager; its writes are batched,
+            # so the file on disk may not have them yet. Read-only commands leave
+            # the version alone and the lookup tables are kept.
+            config = await self.keyword_manager.load_config()
+            if self.keyword_manager.config_version != self._config_version:
+                self.config = config
+                self._config_version = self.keyword_manager.config_version
+                self._apply_config()
             
             # Send response to notification target if it's a test, otherwise to command chat
             notification_target = self.config.get('telegram', {}).get('notification_target', 'me')
@@ -660,6 +896,8 @@ class TelegramKeywordMonitor:
         async def handle_new_message(event):
             await self.message_handler(event)
         
+        self._notify_worker = asyncio.create_task(self._notification_worker())
+        
         logging.info("Keyword monitor is running... Press Ctrl+C to stop.")
         
         try:
@@ -669,7 +907,21 @@ class TelegramKeywordMonitor:
         except Exception as e:
             logging.error(f"Unexpected error: {e}")
         finally:
-            await self.client.disconnect()
+            # Let queued notifications go out before disconnecting, but not forever
+            try:
+                await asyncio.wait_for(self._notify_queue.join(), timeout=self.NOTIFY_DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logging.warning(f"Notifications still pending after {self.NOTIFY_DRAIN_TIMEOUT:.0f}s, shutting down without them")
+            finally:
+                self._notify_worker.cancel()
+            
+            try:
+                await self.keyword_manager.flush()
+            except Exception as e:
+                logging.error(f"Failed to save pending config changes: {e}")
+            finally:
+                await self.client.disconnect()
+                self._stop_logging()
 
 
 async def main():
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Shared Telegram connection handling for the helper scripts
+"""
+
+import os
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Dict, Union
+
+from telethon import TelegramClient
+from telethon.sessions import MemorySession, SQLiteSession
+
+@lru_cache(maxsize=None)
+def _resolve_session_name(session_name: str) -> str:
+    """Map a Docker session path to the local data directory, once per name."""
+    if '/app/data/' not in session_name:
+        return session_name
+    return session_name.replace('/app/data/', './data/')
+
+
+def local_session_name(config: Dict) -> str:
+    """Map the Docker session path from config.json to the local data directory."""
+    return _resolve_session_name(config['telegram']['session_name'])
+
+
+def _open_session(session_name: str, ephemeral: bool) -> Union[str, MemorySession]:
+    """Return an in-memory copy of a saved session, or the session name to use it on disk."""
+    if not ephemeral or not os.path.exists(f"{session_name}.session"):
+        return session_name
+    
+    saved = SQLiteSession(session_name)
+    try:
+        if saved.auth_key is None:
+            return session_name
+        
+        # Only the DC and auth key are needed; entities and update state stay in memory
+        session = MemorySession()
+        session.set_dc(saved.dc_id, saved.server_address, saved.port)
+        session.auth_key = saved.auth_key
+        return session
+    finally:
+        saved.close()
+
+
+@asynccontextmanager
+async def telegram_session(config: Dict, ephemeral: bool = False):
+    """Yield a started TelegramClient and disconnect it afterwards.
+    
+    With ephemeral=True an existing login is copied into a MemorySession so a
+    one-shot script does not write entity and update state back to SQLite.
+    """
+    telegram_config = config['telegram']
+    api_id = int(telegram_config['api_id'])
+    api_hash = telegram_config['api_hash']
+    session_name = local_session_name(config)
+    
+    session = _open_session(session_name, ephemeral)
+    client = TelegramClient(session, api_id, api_hash)
+    try:
+        if not isinstance(session, str):
+            await client.connect()
+            if not await client.is_user_authorized():
+                # The copied key was revoked; log in on the session file instead so
+                # the new key is saved rather than dropped with the in-memory copy
+                await client.disconnect()
+                client = TelegramClient(session_name, api_id, api_hash)
+        await client.start()
+        yield client
+    finally:
+        await client.disconnect()